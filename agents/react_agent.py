@@ -2,42 +2,101 @@
 ReAct Agent implementation - Sequential workflow with reasoning
 Orchestrates query processing through multiple tools
 """
-from llm_setup import get_llm
-from database.schema_prompt import get_schema_prompt
+import time
+from contextlib import contextmanager
 
-# Import individual tools
+# Import individual tools (the LLM client and langchain_groq load on first use)
 from tools.query_enhancer import enhance_query
-from tools.sql_generator import generate_sql
+from tools.sql_generator import generate_sql, rewrite_sql
 from tools.result_summarizer import summarize_results
+from tools.sql_voter import generate_sql_by_vote
 from database.executor import execute_sql
+from config import QUERY_LOG_ENABLED, SQL_CANDIDATES
 
 
-def process_query(user_query: str) -> dict:
+@contextmanager
+def _timed_stage(timings: dict, stage: str):
+    """Record the duration of a workflow stage in milliseconds"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[f"{stage}_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def process_query(user_query: str, session=None, candidates: int = SQL_CANDIDATES,
+                  log: bool = QUERY_LOG_ENABLED) -> dict:
     """
     Process a natural language query through the agent workflow.
     
     Args:
         user_query: User's natural language question
+        session: Optional ConversationSession; follow-up questions then edit
+            the previous SQL instead of regenerating it from scratch
+        candidates: Number of SQL candidates to generate; above 1, candidates are
+            executed in parallel and the answer most of them agree on is used
+        log: Append the question, SQL, result fingerprint and stage timings to the query log
         
     Returns:
-        dict with keys: 'enhanced_query', 'sql', 'results', 'summary', 'reasoning'
+        dict with keys: 'enhanced_query', 'sql', 'results', 'summary', 'reasoning', 'followup',
+        'timings' (plus 'candidates' and 'agreement' when several candidates were generated)
     """
     
     # For now, let's run a simpler direct workflow
     # We'll enhance this with full agent reasoning later
     
+    timings = {}
+    start = time.perf_counter()
+    sql = None
+    enhanced_query = None
+    results = None
+    vote = None
+    followup = False
+    
     try:
-        # Step 1: Enhance query
-        enhanced_query = enhance_query(user_query)
+        summary_question = user_query
+        followup = session is not None and session.is_followup(user_query)
         
-        # Step 2: Generate SQL
-        sql = generate_sql(enhanced_query)
+        if followup:
+            # Follow-up: edit the previous SQL, skipping enhancement and the schema prompt
+            enhanced_query = user_query
+            try:
+                last_turn = session.last_turn
+                with _timed_stage(timings, 'rewrite'):
+                    rewritten = rewrite_sql(last_turn['sql'], last_turn['columns'], user_query)
+                if rewritten is not None:
+                    with _timed_stage(timings, 'execute'):
+                        sql, results = session.execute_followup(rewritten)
+                    previous_question = last_turn['enhanced_query'] or last_turn['question']
+                    summary_question = f"{previous_question} Follow-up: {user_query}"
+            except Exception:
+                sql = None  # Fall back to a full generation below
+            followup = sql is not None
         
-        # Step 3: Execute SQL
-        results = execute_sql(sql)
+        if sql is None:
+            # Step 1: Enhance query
+            context = session.rolling_context() if session is not None else None
+            with _timed_stage(timings, 'enhance'):
+                enhanced_query = enhance_query(user_query, context=context)
+            
+            if candidates > 1:
+                # Steps 2-3: Generate and execute candidates, keep the majority answer
+                with _timed_stage(timings, 'vote'):
+                    vote = generate_sql_by_vote(enhanced_query, candidates)
+                sql, results = vote['sql'], vote['results']
+            else:
+                # Step 2: Generate SQL
+                with _timed_stage(timings, 'generate'):
+                    sql = generate_sql(enhanced_query)
+                
+                # Step 3: Execute SQL
+                with _timed_stage(timings, 'execute'):
+                    results = execute_sql(sql)
         
         # Step 4: Summarize results
-        summary = summarize_results(user_query, sql, results)
+        with _timed_stage(timings, 'summarize'):
+            summary = summarize_results(summary_question, sql, results)
+        timings['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
         
         # Compile workflow info
         workflow_info = {
@@ -45,18 +104,50 @@ def process_query(user_query: str) -> dict:
             'sql': sql,
             'results': results,
             'summary': summary,
-            'reasoning': f"Processed query through {len(results)} result rows"
+            'reasoning': f"Processed query through {len(results)} result rows",
+            'followup': followup,
+            'timings': timings
         }
+        if vote is not None:
+            workflow_info['candidates'] = vote['candidates']
+            workflow_info['agreement'] = vote['agreement']
+        
+        if session is not None:
+            session.add_turn(user_query, enhanced_query, sql, results)
+        
+        if log:
+            _log_query(user_query, enhanced_query, sql, results, followup, vote, timings)
         
         return workflow_info
         
     except Exception as e:
+        timings['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        if log:
+            _log_query(user_query, enhanced_query, sql, results, followup, vote, timings, error=str(e))
         return {
             'error': str(e),
-            'summary': f"I encountered an error: {str(e)}"
+            'summary': f"I encountered an error: {str(e)}",
+            'timings': timings
         }
 
 
+def _log_query(question, enhanced_query, sql, results, followup, vote, timings, error=None):
+    """Queue a query log entry; the result fingerprint is computed by the log writer"""
+    from query_log import get_query_log
+    
+    get_query_log().record({
+        'question': question,
+        'enhanced_query': enhanced_query,
+        'sql': sql,
+        'followup': followup,
+        'candidates': len(vote['candidates']) if vote else 1,
+        'agreement': vote['agreement'] if vote else None,
+        'results': results,
+        'timings': timings,
+        'error': error,
+    })
+
+
 if __name__ == "__main__":
     # Test the agent
     print("Testing ReAct Agent...")
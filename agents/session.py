@@ -0,0 +1,107 @@
+"""
+Conversation session - Per-user state for answering follow-up questions incrementally
+Keeps recent questions, their SQL and a bounded cache of the last result so a
+follow-up can edit the previous query (or query its result) instead of
+regenerating SQL from scratch.
+"""
+import re
+import sqlite3
+
+from config import SESSION_CACHE_MAX_ROWS, SESSION_CONTEXT_TURNS, SESSION_MAX_TURNS
+from database.executor import execute_sql
+
+# Openers and references that only make sense relative to the previous answer.
+# Imperatives like "sort"/"filter" alone also start fresh questions, so they
+# count only together with a reference ("sort those by total").
+FOLLOWUP_PATTERN = re.compile(
+    r"^\s*(now|instead|(and )?(what|how) about|(only|just) (for|in|from|the top|the first)|same (but|for|thing))\b"
+    r"|\b(those|these|them|that list|that result|the previous (result|query|answer|list)|"
+    r"the results? above|above results?)\b",
+    re.IGNORECASE
+)
+PREV_TABLE_PATTERN = re.compile(r"\b(FROM|JOIN)\s+prev\b", re.IGNORECASE)
+TABLE_REFERENCE_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+([\w\"\[\]]+)", re.IGNORECASE)
+
+
+class ConversationSession:
+    """
+    Rolling state of one user's conversation.
+
+    Each turn records the question, its enhanced form, the SQL that answered
+    it (always runnable against the database) and the result's columns and
+    row count. Only the latest result rows are cached, and only when small.
+    """
+
+    def __init__(self, max_turns: int = SESSION_MAX_TURNS):
+        self.max_turns = max_turns
+        self.turns = []
+        self._cached_rows = None
+
+    @property
+    def last_turn(self):
+        return self.turns[-1] if self.turns else None
+
+    def is_followup(self, question: str) -> bool:
+        """True if there is a previous answer and the question reads as building on it"""
+        return self.last_turn is not None and bool(FOLLOWUP_PATTERN.search(question))
+
+    def rolling_context(self) -> str:
+        """Compact summary of the last few questions for the enhancer prompt"""
+        lines = []
+        for turn in self.turns[-SESSION_CONTEXT_TURNS:]:
+            question = turn['enhanced_query'] or turn['question']
+            lines.append(f"- {question[:200]} ({turn['row_count']} rows)")
+        return "\n".join(lines)
+
+    def expand_sql(self, sql: str) -> str:
+        """Make a follow-up SQL that reads `prev` runnable against the database"""
+        if not PREV_TABLE_PATTERN.search(sql):
+            return sql
+        previous_sql = self.last_turn['sql'].strip().rstrip(';')
+        return f"SELECT * FROM (WITH prev AS ({previous_sql}) {sql.strip().rstrip(';')})"
+
+    def execute_followup(self, sql: str):
+        """
+        Run a rewritten follow-up query.
+
+        Queries that read only `prev` run on the cached previous result in an
+        in-memory database; anything else runs against Chinook with `prev`
+        expanded to the previous SQL.
+
+        Returns:
+            (sql, results) where sql is runnable against the database
+        """
+        full_sql = self.expand_sql(sql)
+        tables = {name.strip('"[]').lower() for name in TABLE_REFERENCE_PATTERN.findall(sql)}
+        if tables != {'prev'} or self._cached_rows is None:
+            return full_sql, execute_sql(full_sql)
+
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        try:
+            columns = self.last_turn['columns']
+            column_list = ", ".join('"' + c.replace('"', '""') + '"' for c in columns)
+            conn.execute(f"CREATE TABLE prev ({column_list})")
+            conn.executemany(
+                f"INSERT INTO prev VALUES ({', '.join('?' * len(columns))})",
+                (tuple(row[c] for c in columns) for row in self._cached_rows)
+            )
+            return full_sql, execute_sql(sql, conn=conn)
+        finally:
+            conn.close()
+
+    def add_turn(self, question: str, enhanced_query: str, sql: str, results: list):
+        """Record an answered question, keeping at most max_turns turns"""
+        self.turns.append({
+            'question': question,
+            'enhanced_query': enhanced_query,
+            'sql': sql,
+            'columns': list(results[0].keys()) if results else [],
+            'row_count': len(results),
+        })
+        del self.turns[:-self.max_turns]
+        self._cached_rows = results if 0 < len(results) <= SESSION_CACHE_MAX_ROWS else None
+
+    def clear(self):
+        self.turns = []
+        self._cached_rows = None
@@ -1,8 +1,17 @@
 """
 Main Streamlit application for Natural Language Data Assistant
 """
+import os
+import tempfile
+from pathlib import Path
+
 import streamlit as st
+from config import RESULT_PREVIEW_ROWS, SQL_CANDIDATES, WARMUP_ENABLED
+from warmup import start_warmup, get_warmup_status
 from agents.react_agent import process_query
+from agents.session import ConversationSession
+from database.aggregator import build_chart
+from database.exporter import export_results
 
 # Page config
 st.set_page_config(
@@ -11,6 +20,10 @@ st.set_page_config(
     layout="wide"
 )
 
+# Start background warm-up once per process (later reruns are no-ops)
+if WARMUP_ENABLED:
+    start_warmup()
+
 # Custom CSS for warmer tones and minimal aesthetic
 st.markdown("""
 <style>
@@ -66,6 +79,56 @@ st.markdown("""
 st.title("📊 Natural Language Data Assistant")
 st.markdown("Ask questions about your data in plain English")
 
+# Warm-up readiness
+if WARMUP_ENABLED:
+    with st.sidebar:
+        warmup_status = get_warmup_status()
+        if warmup_status['state'] == 'ready':
+            st.caption(f"⚡ Warm-up ready in {warmup_status['total_ms']:.0f} ms")
+            for stage_name, error in warmup_status['errors'].items():
+                st.caption(f"⚠️ {stage_name}: {error}")
+        else:
+            st.caption("⏳ Warming up...")
+
+# Conversation state (follow-ups like "now only for 2012" reuse the previous SQL)
+if 'conversation' not in st.session_state:
+    st.session_state.conversation = ConversationSession()
+
+def _discard_export():
+    """Delete this session's prepared export file, if any"""
+    export = st.session_state.pop('export', None)
+    if export:
+        Path(export['path']).unlink(missing_ok=True)
+
+def _prepare_export(sql: str, export_format: str):
+    """
+    Export to a unique temporary file, replacing this session's previous export.
+
+    export_results only publishes the file once complete, so a failed export
+    never offers a truncated file for download.
+    """
+    _discard_export()
+    fd, export_path = tempfile.mkstemp(prefix="data-assistant-", suffix=f".{export_format}")
+    os.close(fd)
+    with st.spinner("Exporting..."):
+        try:
+            export_results(sql, export_path, fmt=export_format)
+        except Exception as e:
+            Path(export_path).unlink(missing_ok=True)
+            st.error(f"Export failed: {e}")
+            return
+    st.session_state.export = {'sql': sql, 'format': export_format, 'path': export_path}
+
+with st.sidebar:
+    if st.button("🔄 New conversation"):
+        st.session_state.conversation.clear()
+        st.session_state.pop('last_query', None)
+        _discard_export()
+    sql_candidates = st.slider(
+        "SQL candidates", min_value=1, max_value=5, value=SQL_CANDIDATES,
+        help="Generate several SQL queries in parallel and keep the answer most of them agree on"
+    )
+
 # Main input area
 user_query = st.text_input(
     "Enter your question:",
@@ -75,9 +138,17 @@ user_query = st.text_input(
 
 # Output area
 if user_query:
-    with st.spinner("Processing your query..."):
-        # Process query through agent
-        result = process_query(user_query)
+    # Streamlit reruns this script on every interaction; only process new questions
+    if st.session_state.get('last_query') != user_query:
+        with st.spinner("Processing your query..."):
+            # Process query through agent
+            st.session_state.last_result = process_query(
+                user_query, session=st.session_state.conversation, candidates=sql_candidates
+            )
+            st.session_state.last_query = user_query
+            st.session_state.pop('last_chart', None)
+            _discard_export()
+    result = st.session_state.last_result
     
     with st.container():
         st.divider()
@@ -90,10 +161,26 @@ if user_query:
             with col1:
                 st.markdown("**1️⃣ Query Enhancement**")
                 st.code(result.get('enhanced_query', 'N/A'))
+                if result.get('followup'):
+                    st.caption("↪️ Follow-up: edited the previous SQL instead of regenerating it")
             
             with col2:
                 st.markdown("**2️⃣ SQL Generation**")
                 st.code(result.get('sql', 'N/A'), language='sql')
+                if 'candidates' in result:
+                    failed = sum(candidate['error'] is not None for candidate in result['candidates'])
+                    st.caption(f"🗳️ {result['agreement']:.0%} agreement across {len(result['candidates'])} candidates"
+                               + (f" ({failed} failed)" if failed else ""))
+                    st.dataframe([
+                        {
+                            'sql': candidate['sql'] or candidate['error'],
+                            'generation_ms': candidate['generation_ms'],
+                            'execution_ms': candidate.get('execution_ms'),
+                            'rows': candidate.get('rows'),
+                            'votes': candidate.get('votes'),
+                        }
+                        for candidate in result['candidates']
+                    ])
         
         # Result section
         st.subheader("💬 Result")
@@ -107,8 +194,51 @@ if user_query:
             if 'results' in result:
                 num_results = len(result['results'])
                 st.caption(f"📊 Found {num_results} rows" if num_results > 0 else "📊 No results found")
+                
+                if num_results > 0:
+                    # Only bounded-size series and a row preview are sent to the browser.
+                    # The chart queries run once per result, not on every widget rerun.
+                    if 'last_chart' not in st.session_state:
+                        try:
+                            st.session_state.last_chart = (build_chart(result['sql'], result['results']), None)
+                        except Exception as e:
+                            st.session_state.last_chart = (None, str(e))
+                    chart, chart_error = st.session_state.last_chart
+                    if chart_error:
+                        st.caption(f"⚠️ Chart unavailable: {chart_error}")
+                    
+                    if chart:
+                        draw_chart = st.line_chart if chart['chart'] == 'line' else st.bar_chart
+                        draw_chart(chart['data'], x=chart['x'], y=chart['y'])
+                        if chart['downsampled']:
+                            st.caption(f"Chart aggregated from {chart['source_rows']} rows")
+                    
+                    st.dataframe([dict(row) for row in result['results'][:RESULT_PREVIEW_ROWS]])
+                    if num_results > RESULT_PREVIEW_ROWS:
+                        st.caption(f"Showing the first {RESULT_PREVIEW_ROWS} of {num_results} rows")
+                    
+                    # Full export is streamed from SQLite to a file, not built from the rows above
+                    export_col1, export_col2 = st.columns([1, 3])
+                    with export_col1:
+                        export_format = st.radio("Export format", ["parquet", "csv"], horizontal=True)
+                    with export_col2:
+                        if st.button("📦 Prepare full export"):
+                            _prepare_export(result['sql'], export_format)
+                        export = st.session_state.get('export')
+                        if export and export['sql'] == result['sql'] and export['format'] == export_format:
+                            # Read only when clicked, not on every rerun
+                            st.download_button(
+                                f"⬇️ Download {export_format.upper()}",
+                                data=Path(export['path']).read_bytes,
+                                file_name=f"query_result.{export_format}",
+                                mime="text/csv" if export_format == "csv" else "application/octet-stream"
+                            )
 else:
     # Show instructions when no query
     with st.container():
         st.info("💡 Enter a natural language question about the Chinook database above to get started!")
 
+# Conversation history
+with st.sidebar:
+    for turn in st.session_state.conversation.turns:
+        st.caption(f"• {turn['question']}")
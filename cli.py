@@ -0,0 +1,223 @@
+"""
+Command line entry point for the Data Assistant
+SQL-only and schema-only commands never import the LLM stack.
+
+Usage:
+    python cli.py sql "SELECT Name FROM Artist LIMIT 5"
+    python cli.py schema [--summary]
+    python cli.py ask "Show me the top 5 artists"
+    python cli.py batch questions.jsonl -o results.jsonl --workers 8
+    python cli.py export "SELECT * FROM InvoiceLine" -o invoice_lines.parquet
+    python cli.py replay --since 2026-10-01 --until 2026-10-08 -o replay_report.json
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+from config import QUERY_LOG_PATH, SERVICE_MAX_PENDING, SERVICE_POOL, SERVICE_WORKERS, SQL_CANDIDATES
+
+
+def cmd_sql(args) -> int:
+    """Execute a read-only SQL query and print one JSON object per row"""
+    from database.executor import execute_sql
+
+    try:
+        results = execute_sql(args.query)
+    except Exception as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    for row in results:
+        print(json.dumps(dict(row), default=str))
+    return 0
+
+
+def cmd_schema(args) -> int:
+    """Print the schema used in LLM prompts, or a one-line-per-table summary"""
+    from database.schema_prompt import get_schema_prompt, get_schema_summary
+
+    try:
+        print(get_schema_summary() if args.summary else get_schema_prompt())
+    except Exception as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_ask(args) -> int:
+    """Run a natural language question through the full agent workflow"""
+    from agents.react_agent import process_query
+
+    result = process_query(args.question, candidates=args.candidates)
+    if 'error' in result:
+        print(f"[ERROR] {result['error']}", file=sys.stderr)
+        return 1
+
+    print(f"SQL: {result['sql']}")
+    if 'candidates' in result:
+        failed = sum(candidate['error'] is not None for candidate in result['candidates'])
+        print(f"Agreement: {result['agreement']:.0%} of {len(result['candidates'])} candidates"
+              + (f" ({failed} failed)" if failed else ""))
+    print(f"\n{result['summary']}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    """Stream the full result of a SQL query to a CSV or Parquet file"""
+    from database.exporter import export_results
+
+    try:
+        export = export_results(args.query, args.output, fmt=args.format)
+    except Exception as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    print(f"[OK] Wrote {export['rows']} rows to {export['path']} ({export['bytes']:,} bytes)", file=sys.stderr)
+    return 0
+
+
+def cmd_batch(args) -> int:
+    """
+    Answer questions from a JSONL file on a worker pool, writing JSONL results.
+
+    Each input line is {"question": "...", ...}; extra keys such as "id" are
+    copied to the output. Results are written in input order and at most
+    `max_pending` questions are held in memory at once. An invalid line gets
+    an {"error": ...} output line and the batch continues.
+    """
+    from concurrent.futures import Future
+
+    from llm_scheduler import BATCH
+    from service import QueryPool
+
+    # Batch questions yield the rate limit to interactive users
+    pool = QueryPool(workers=args.workers, kind=args.pool, max_pending=args.max_pending, priority=BATCH)
+    in_flight = deque()
+    failures = 0
+
+    def write_next(output):
+        nonlocal failures
+        request, future = in_flight.popleft()
+        result = future.result()
+        failures += 'error' in result
+        output.write(json.dumps({**request, **result}, default=str) + "\n")
+
+    input_file = open(args.input, "r", encoding="utf-8") if args.input != "-" else sys.stdin
+    output_file = open(args.output, "w", encoding="utf-8") if args.output != "-" else sys.stdout
+    try:
+        for line_number, line in enumerate(input_file, start=1):
+            if not line.strip():
+                continue
+            if len(in_flight) >= args.max_pending:
+                write_next(output_file)
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict) or not isinstance(request.get('question'), str):
+                    raise ValueError('expected an object with a "question" string')
+            except ValueError as e:
+                error = f"Invalid input on line {line_number}: {e}"
+                print(f"[ERROR] {error}", file=sys.stderr)
+                invalid = Future()
+                invalid.set_result({'error': error})
+                in_flight.append(({'line': line_number}, invalid))
+                continue
+            in_flight.append((request, pool.submit(request['question'], block=True)))
+        while in_flight:
+            write_next(output_file)
+    finally:
+        pool.shutdown()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    metrics = pool.metrics()
+    print(f"[OK] {metrics['completed']} answered, {metrics['failed']} failed, "
+          f"p50 {metrics['latency_p50_ms']} ms, p95 {metrics['latency_p95_ms']} ms", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_replay(args) -> int:
+    """
+    Re-run a window of logged questions and report changed answers and latencies.
+
+    Exits non-zero when answers fail that did not before, or when the p90
+    total latency grew by more than --max-regression percent.
+    """
+    from replay import format_report, run_replay
+
+    try:
+        report = run_replay(args.log, since=args.since, until=args.until,
+                            workers=args.workers, limit=args.limit)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    total_change = (report['stages'].get('total') or {}).get('change_pct') or {}
+    regressed = (args.max_regression is not None and total_change.get('p90') is not None
+                 and total_change['p90'] > args.max_regression)
+    return 1 if report['new_errors'] or regressed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subcommand per entry point"""
+    parser = argparse.ArgumentParser(description="Natural Language Data Assistant")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sql_parser = subparsers.add_parser("sql", help="Execute a read-only SQL query")
+    sql_parser.add_argument("query", help="SELECT statement to execute")
+    sql_parser.set_defaults(func=cmd_sql)
+
+    schema_parser = subparsers.add_parser("schema", help="Print the database schema")
+    schema_parser.add_argument("--summary", action="store_true", help="Print table(column, ...) lines only")
+    schema_parser.set_defaults(func=cmd_schema)
+
+    ask_parser = subparsers.add_parser("ask", help="Answer a natural language question")
+    ask_parser.add_argument("question", help="Question about the Chinook database")
+    ask_parser.add_argument("--candidates", type=int, default=SQL_CANDIDATES,
+                            help="SQL candidates to generate and vote on (1 disables voting)")
+    ask_parser.set_defaults(func=cmd_ask)
+
+    export_parser = subparsers.add_parser("export", help="Export a query's full result to CSV or Parquet")
+    export_parser.add_argument("query", help="SELECT statement to export")
+    export_parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .parquet)")
+    export_parser.add_argument("--format", choices=["csv", "parquet"], help="Defaults to the output file extension")
+    export_parser.set_defaults(func=cmd_export)
+
+    batch_parser = subparsers.add_parser("batch", help="Answer questions from a JSONL file")
+    batch_parser.add_argument("input", help="JSONL file of {\"question\": ...} objects ('-' for stdin)")
+    batch_parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    batch_parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Concurrent queries")
+    batch_parser.add_argument("--pool", choices=["thread", "process"], default=SERVICE_POOL, help="Worker pool kind")
+    batch_parser.add_argument("--max-pending", type=int, default=SERVICE_MAX_PENDING,
+                              help="Questions queued or running at once")
+    batch_parser.set_defaults(func=cmd_batch)
+
+    replay_parser = subparsers.add_parser("replay", help="Replay logged questions and compare with the log")
+    replay_parser.add_argument("--log", default=QUERY_LOG_PATH, help="Query log file (JSONL)")
+    replay_parser.add_argument("--since", help="ISO timestamp of the first question to replay (UTC)")
+    replay_parser.add_argument("--until", help="ISO timestamp to stop at (exclusive)")
+    replay_parser.add_argument("--limit", type=int, help="Replay at most this many questions")
+    replay_parser.add_argument("--workers", type=int, default=1,
+                               help="Concurrent replays (1 keeps latencies comparable)")
+    replay_parser.add_argument("-o", "--output", help="Write the full report as JSON")
+    replay_parser.add_argument("--max-regression", type=float,
+                               help="Fail if p90 total latency grew by more than this percent")
+    replay_parser.set_defaults(func=cmd_replay)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
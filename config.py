@@ -2,23 +2,79 @@
 Configuration file for LLM and database settings
 """
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from functools import lru_cache
+from pathlib import Path
 
 # GROQ API Configuration
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 LLM_MODEL = "llama-3.3-70b-versatile"
 LLM_TEMPERATURE = 0.1  # Lower temperature for more consistent SQL generation
 
+# LLM request scheduling (llm_scheduler.py)
+LLM_TOKENS_PER_MINUTE = 12000      # Starting budget; corrected by x-ratelimit-* response headers
+LLM_EXPECTED_OUTPUT_TOKENS = 256   # Output tokens reserved per request on top of the prompt
+LLM_MAX_RETRIES = 5
+LLM_BACKOFF_BASE_S = 0.5
+LLM_BACKOFF_MAX_S = 20.0
+
+# Result summarizer prompt (tools/result_encoder.py)
+SUMMARY_TOKEN_BUDGET = 250     # Estimated tokens allowed for result rows in the prompt
+SUMMARY_MAX_ROWS = 10          # Sample rows sent to the summarizer; the rest are counted
+SUMMARY_MAX_CELL_CHARS = 60    # Longer text values are truncated
+SUMMARY_MAX_COLUMNS = 20       # Wider results keep their first columns only
+
 # Database Configuration
-from pathlib import Path
 DATABASE_PATH = str(Path(__file__).parent / "database" / "chinook.db")
+DB_MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database file SQLite may memory-map
+DB_POOL_SIZE = 4  # Pooled read-only connections (database/pool.py)
+
+# Export Configuration (database/exporter.py)
+EXPORT_CHUNK_ROWS = 50000              # Rows fetched and written per batch (Parquet row group)
+EXPORT_PARQUET_COMPRESSION = "zstd"
+
+# Multi-candidate SQL generation (tools/sql_voter.py)
+SQL_CANDIDATES = 1                # 1 disables voting; N > 1 generates N candidates
+SQL_CANDIDATE_TEMPERATURE = 0.7   # Temperature of candidates after the first
+SQL_CANDIDATE_TIMEOUT_S = 5.0     # Time budget per candidate execution
+
+# Chart Configuration (database/aggregator.py)
+CHART_MAX_POINTS = 200        # Larger line charts are bucketed in SQL to this many points
+CHART_MAX_CATEGORIES = 20     # Bar charts keep the largest categories only
+CHART_HISTOGRAM_BINS = 20
+RESULT_PREVIEW_ROWS = 100     # Rows shown in the result table
+
+# Conversation session Configuration (agents/session.py)
+SESSION_MAX_TURNS = 10          # Turns kept per conversation
+SESSION_CONTEXT_TURNS = 3       # Earlier questions passed to the query enhancer
+SESSION_CACHE_MAX_ROWS = 10000  # Last results up to this size are cached for follow-ups
+
+# Startup warm-up Configuration
+WARMUP_ENABLED = True
+WARMUP_HOT_TABLES = ["Track", "InvoiceLine", "Invoice", "Album", "Artist", "Customer", "Genre"]
+
+# Headless service Configuration (cli.py batch and service.py)
+SERVICE_WORKERS = 4        # Queries processed concurrently
+SERVICE_POOL = "thread"    # "thread" or "process"
+SERVICE_MAX_PENDING = 32   # Queued + running queries before new ones are rejected
+
+# Query log Configuration (query_log.py and replay.py)
+QUERY_LOG_ENABLED = True
+QUERY_LOG_PATH = str(Path(__file__).parent / "logs" / "query_log.jsonl")
+QUERY_LOG_BATCH_SIZE = 50          # Entries written per append
+QUERY_LOG_FLUSH_INTERVAL_S = 1.0   # Longest an entry waits for a batch to fill
+
+@lru_cache(maxsize=1)
+def load_env():
+    """Load variables from .env once, on first use rather than at import time"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+def get_groq_api_key():
+    """Return the GROQ API key from the environment (or .env file)"""
+    load_env()
+    return os.getenv("GROQ_API_KEY")
 
 # Validate required environment variables (only when actually using LLM)
 def validate_config():
     """Validate that required config is set"""
-    if not GROQ_API_KEY:
+    if not get_groq_api_key():
         raise ValueError("GROQ_API_KEY not found in environment variables. Please set it in .env file")
-
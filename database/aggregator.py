@@ -0,0 +1,174 @@
+"""
+Chart aggregator - Turns query results into bounded-size chart series
+Infers a chart type from the result shape and, for large results, pushes
+bucketing and top-N aggregation into SQLite by wrapping the original query.
+"""
+import re
+
+from config import CHART_HISTOGRAM_BINS, CHART_MAX_CATEGORIES, CHART_MAX_POINTS
+from database.executor import execute_sql
+
+# Dates and date prefixes produced by strftime: '2012', '2012-03', '2012-03-05 ...'
+DATE_PATTERN = re.compile(r"^(1[89]|2[01])\d{2}(-\d{2}(-\d{2}([ T][\d:.]+Z?)?)?)?$")
+TIME_NAME_PATTERN = re.compile(r"(year|quarter|month|week|date)$|^day$", re.IGNORECASE)
+SAMPLE_ROWS = 20  # Rows inspected to classify each column
+
+def _quote(name: str) -> str:
+    """Quote a column name as an SQLite identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+def classify_columns(results: list) -> dict:
+    """
+    Classify each column as 'temporal', 'numeric', 'categorical' or 'empty'
+    from the first non-null values in the result.
+
+    Date strings (including 'YYYY' and 'YYYY-MM' prefixes) are temporal, as
+    are integers in a time-named column such as Year or Month.
+    """
+    kinds = {}
+    for column in results[0].keys():
+        sample = next((row[column] for row in results[:SAMPLE_ROWS] if row[column] is not None), None)
+        if sample is None:
+            kinds[column] = 'empty'
+        elif isinstance(sample, int) and TIME_NAME_PATTERN.search(column):
+            kinds[column] = 'temporal'
+        elif isinstance(sample, (int, float)):
+            kinds[column] = 'numeric'
+        elif isinstance(sample, str) and DATE_PATTERN.match(sample):
+            kinds[column] = 'temporal'
+        else:
+            kinds[column] = 'categorical'
+    return kinds
+
+def infer_chart(results: list):
+    """
+    Pick a chart for the result shape.
+
+    Returns:
+        (chart, x, y_columns) where chart is 'line', 'bar' or 'histogram',
+        or None when the result is not chartable (single row, text only...)
+    """
+    if len(results) < 2:
+        return None
+
+    kinds = classify_columns(results)
+    columns = list(kinds)
+    # Identifier columns are keys, not measures
+    measures = [c for c in columns if kinds[c] == 'numeric' and not c.lower().endswith("id")]
+
+    temporal = [c for c in columns if kinds[c] == 'temporal']
+    if temporal:
+        return 'line', temporal[0], measures
+
+    categorical = [c for c in columns if kinds[c] == 'categorical']
+    if categorical:
+        sample = [row[categorical[0]] for row in results[:SAMPLE_ROWS]]
+        if not measures and len(set(sample)) == len(sample):
+            return None  # A plain list of distinct names has nothing to count
+        return 'bar', categorical[0], measures
+
+    if len(measures) == 1:
+        return 'histogram', measures[0], []
+    if len(measures) >= 2:
+        return 'line', measures[0], measures[1:]
+    return None
+
+def _bounds(sql: str, x_expr: str):
+    row = execute_sql(f"SELECT MIN({x_expr}), MAX({x_expr}) FROM ({sql})")[0]
+    return row[0], row[1]
+
+def _date_expr(column: str) -> str:
+    """julianday() of a date string, completing 'YYYY' and 'YYYY-MM' to their first day"""
+    return (f"julianday(CASE length({column}) WHEN 4 THEN {column} || '-01-01' "
+            f"WHEN 7 THEN {column} || '-01' ELSE {column} END)")
+
+def _bucketed_series(sql: str, x: str, y_columns: list, dates: bool) -> list:
+    """Average each measure over CHART_MAX_POINTS equal-width buckets of x"""
+    x_expr = _date_expr(_quote(x)) if dates else _quote(x)
+    low, high = _bounds(sql, x_expr)
+    if low is None:
+        return []
+    width = (high - low) / CHART_MAX_POINTS or 1
+
+    measures = [f"AVG({_quote(y)}) AS {_quote(y)}" for y in y_columns] or ["COUNT(*) AS \"count\""]
+    return execute_sql(
+        f"SELECT MIN({_quote(x)}) AS {_quote(x)}, {', '.join(measures)} "
+        f"FROM ({sql}) WHERE {x_expr} IS NOT NULL "
+        f"GROUP BY MIN(CAST(({x_expr} - {low!r}) / {width!r} AS INTEGER), {CHART_MAX_POINTS - 1}) ORDER BY 1"
+    )
+
+def _top_categories(sql: str, x: str, y_columns: list) -> list:
+    """Sum each measure per category and keep the CHART_MAX_CATEGORIES largest"""
+    measures = [f"SUM({_quote(y)}) AS {_quote(y)}" for y in y_columns] or ["COUNT(*) AS \"count\""]
+    return execute_sql(
+        f"SELECT {_quote(x)}, {', '.join(measures)} FROM ({sql}) "
+        f"GROUP BY {_quote(x)} ORDER BY 2 DESC LIMIT {int(CHART_MAX_CATEGORIES)}"
+    )
+
+def _histogram(sql: str, x: str) -> list:
+    """Count values in CHART_HISTOGRAM_BINS equal-width bins"""
+    low, high = _bounds(sql, _quote(x))
+    if low is None:
+        return []
+    bins = int(CHART_HISTOGRAM_BINS)
+    width = (high - low) / bins or 1
+
+    rows = execute_sql(
+        f"SELECT MIN(CAST(({_quote(x)} - {low!r}) / {width!r} AS INTEGER), {bins - 1}) AS bin, COUNT(*) AS \"count\" "
+        f"FROM ({sql}) WHERE {_quote(x)} IS NOT NULL GROUP BY bin ORDER BY bin"
+    )
+    return [{x: round(low + row['bin'] * width, 2), 'count': row['count']} for row in rows]
+
+def build_chart(sql: str, results: list):
+    """
+    Build a bounded-size chart series for a query result.
+
+    Small results are charted as they are; larger ones are reduced in SQLite
+    so at most CHART_MAX_POINTS points (or CHART_MAX_CATEGORIES bars) come back.
+
+    Args:
+        sql: The SELECT statement that produced `results`
+        results: Result rows already fetched for `sql`
+
+    Returns:
+        dict with keys 'chart', 'x', 'y', 'data' (column -> list of values),
+        'downsampled' and 'source_rows', or None if the result is not chartable
+    """
+    chart_spec = infer_chart(results)
+    if chart_spec is None:
+        return None
+    chart, x, y_columns = chart_spec
+
+    sql = sql.strip().rstrip(";")
+    limit = CHART_MAX_CATEGORIES if chart == 'bar' else CHART_MAX_POINTS
+    downsampled = chart == 'histogram' or len(results) > limit
+
+    if chart == 'histogram':
+        rows = _histogram(sql, x)
+    elif not downsampled:
+        rows = results
+        if chart == 'line':
+            # Queries often order by a measure; a line must follow x
+            rows = sorted(rows, key=lambda row: (row[x] is None, row[x] if row[x] is not None else 0))
+    elif chart == 'bar':
+        rows = _top_categories(sql, x, y_columns)
+    else:
+        sample = next((row[x] for row in results if row[x] is not None), None)
+        rows = _bucketed_series(sql, x, y_columns, dates=isinstance(sample, str))
+
+    y = y_columns if (y_columns and chart != 'histogram') else ['count']
+    if not y_columns and not downsampled:
+        # Small result without measures: count rows per x value
+        counts = {}
+        for row in rows:
+            counts[row[x]] = counts.get(row[x], 0) + 1
+        rows = [{x: key, 'count': value} for key, value in counts.items()]
+
+    return {
+        'chart': chart,
+        'x': x,
+        'y': y,
+        'data': {column: [row[column] for row in rows] for column in [x] + y},
+        'downsampled': downsampled,
+        'source_rows': len(results),
+    }
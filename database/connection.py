@@ -3,10 +3,9 @@ Database connection handler for Chinook database
 """
 import sqlite3
 from pathlib import Path
-from config import DATABASE_PATH
+from config import DATABASE_PATH, DB_MMAP_SIZE
 
-def get_db_connection():
-    """Create and return a database connection"""
+def _check_database_exists() -> Path:
     db_path = Path(DATABASE_PATH)
     
     if not db_path.exists():
@@ -14,9 +13,25 @@ def get_db_connection():
             f"Database file not found at {DATABASE_PATH}. "
             "Please download the Chinook database first."
         )
+    return db_path
+
+def get_db_connection():
+    """Create and return a database connection"""
+    db_path = _check_database_exists()
     
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
+    conn.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE)}")  # Serve reads from the OS page cache
     return conn
 
-
+def get_readonly_connection():
+    """
+    Create a read-only connection that may be shared across threads.
+    SQLite itself rejects writes on it, on top of the executor's checks.
+    """
+    db_path = _check_database_exists()
+    
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE)}")
+    return conn
@@ -4,19 +4,15 @@ SQL Executor - Safely executes SQL queries with read-only enforcement
 from database.connection import get_db_connection
 import re
 
-def execute_sql(sql: str) -> list:
+def validate_sql(sql: str):
     """
-    Execute a SQL query safely (read-only).
+    Check that a SQL query is a read-only SELECT statement.
     
     Args:
         sql: SQL query string
         
-    Returns:
-        List of result rows (each row is a dict-like object)
-        
     Raises:
-        ValueError: If query is not a SELECT statement
-        Exception: If SQL execution fails
+        ValueError: If query is not a SELECT statement or contains a dangerous keyword
     """
     # Security: Ensure it's a SELECT statement
     sql_stripped = sql.strip().upper()
@@ -39,9 +35,29 @@ def execute_sql(sql: str) -> list:
     for keyword in dangerous_keywords:
         if keyword in sql_upper:
             raise ValueError(f"Dangerous SQL keyword detected: {keyword}")
+
+def execute_sql(sql: str, conn=None) -> list:
+    """
+    Execute a SQL query safely (read-only).
+    
+    Args:
+        sql: SQL query string
+        conn: Optional open connection to run on (left open); defaults to a
+            new connection to the Chinook database, closed afterwards
+        
+    Returns:
+        List of result rows (each row is a dict-like object)
+        
+    Raises:
+        ValueError: If query is not a SELECT statement
+        Exception: If SQL execution fails
+    """
+    validate_sql(sql)
     
     # Execute query
-    conn = get_db_connection()
+    owns_connection = conn is None
+    if owns_connection:
+        conn = get_db_connection()
     try:
         cursor = conn.cursor()
         cursor.execute(sql)
@@ -50,6 +66,7 @@ def execute_sql(sql: str) -> list:
     except Exception as e:
         raise Exception(f"SQL execution error: {str(e)}")
     finally:
-        conn.close()
+        if owns_connection:
+            conn.close()
 
 
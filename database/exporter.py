@@ -0,0 +1,190 @@
+"""
+Result Exporter - Streams query results to CSV or Parquet files with constant memory
+Rows are read from the SQLite cursor in chunks and written as they arrive, so
+exports are bounded by disk space rather than the worker's RAM.
+"""
+import csv
+import os
+from pathlib import Path
+
+from config import EXPORT_CHUNK_ROWS, EXPORT_PARQUET_COMPRESSION
+from database.connection import get_readonly_connection
+from database.executor import validate_sql
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+def _open_cursor(sql: str):
+    """Validate the query and return (connection, cursor) positioned before the first row"""
+    validate_sql(sql)
+    conn = get_readonly_connection()
+    conn.row_factory = None  # Plain tuples are cheaper to stream than sqlite3.Row
+    try:
+        return conn, conn.execute(sql)
+    except Exception as e:
+        conn.close()
+        raise Exception(f"SQL execution error: {str(e)}")
+
+def export_csv(sql: str, path, chunk_size: int = EXPORT_CHUNK_ROWS) -> int:
+    """
+    Stream query results to a CSV file with a header row.
+
+    Args:
+        sql: SELECT statement to export
+        path: Output file path
+        chunk_size: Rows fetched from SQLite per batch
+
+    Returns:
+        Number of rows written
+    """
+    conn, cursor = _open_cursor(sql)
+    rows_written = 0
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(column[0] for column in cursor.description)
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                rows_written += len(chunk)
+    finally:
+        conn.close()
+    return rows_written
+
+def _infer_arrow_type(pa, values: list):
+    """Arrow type for a column from the Python types SQLite returned for it"""
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds:
+        return pa.string()
+    if kinds <= {int}:
+        return pa.int64()
+    if kinds <= {int, float}:
+        return pa.float64()
+    if kinds <= {bytes}:
+        return pa.binary()
+    return pa.string()
+
+def _to_arrow_column(pa, values: list, arrow_type):
+    if arrow_type == pa.string():
+        values = [None if v is None else str(v) for v in values]
+    elif arrow_type == pa.float64():
+        values = [None if v is None else float(v) for v in values]
+    return pa.array(values, type=arrow_type)
+
+def _result_column_types(sql: str, columns: list, pa) -> list:
+    """
+    Arrow types for each column from the storage classes over the whole result.
+
+    SQLite types values per row, so a NUMERIC column can hold 1 (integer) in the
+    first chunk and 0.99 (real) or 'n/a' (text) later. One aggregate pass, run
+    inside SQLite without materializing rows, collects every class per column:
+    mixed numbers become float64, anything mixed with text or blobs a string.
+    """
+    quoted = ['"' + column.replace('"', '""') + '"' for column in columns]
+    checks = ", ".join(f"GROUP_CONCAT(DISTINCT typeof({column}))" for column in quoted)
+    conn, cursor = _open_cursor(f"SELECT {checks} FROM ({sql.strip().rstrip(';')})")
+    try:
+        classes = cursor.fetchone()
+    finally:
+        conn.close()
+
+    types = []
+    for found in classes:
+        kinds = set((found or "").split(",")) - {"null", ""}
+        if not kinds or "text" in kinds or (len(kinds) > 1 and "blob" in kinds):
+            types.append(pa.string())
+        elif kinds == {"integer"}:
+            types.append(pa.int64())
+        elif kinds == {"blob"}:
+            types.append(pa.binary())
+        else:
+            types.append(pa.float64())
+    return types
+
+def export_parquet(sql: str, path, chunk_size: int = EXPORT_CHUNK_ROWS,
+                   compression: str = EXPORT_PARQUET_COMPRESSION) -> int:
+    """
+    Stream query results to a compressed, column-typed Parquet file.
+
+    Column types are inferred from the first chunk, or from a typeof() pass
+    over the whole result when more chunks follow; each chunk becomes one row
+    group, so memory use is bounded by chunk_size.
+
+    Args:
+        sql: SELECT statement to export
+        path: Output file path
+        chunk_size: Rows fetched from SQLite per batch (and per row group)
+        compression: Parquet codec (zstd, snappy, gzip, none)
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+
+    conn, cursor = _open_cursor(sql)
+    rows_written = 0
+    writer = None
+    try:
+        columns = [column[0] for column in cursor.description]
+        chunk = cursor.fetchmany(chunk_size)
+        column_values = [list(values) for values in zip(*chunk)] if chunk else [[] for _ in columns]
+        if len(chunk) == chunk_size:
+            # More rows follow, possibly with other types than the first chunk
+            types = _result_column_types(sql, columns, pa)
+        else:
+            types = [_infer_arrow_type(pa, values) for values in column_values]
+        schema = pa.schema([pa.field(name, arrow_type) for name, arrow_type in zip(columns, types)])
+
+        writer = pq.ParquetWriter(str(path), schema, compression=compression)
+        while True:
+            if chunk:
+                arrays = [_to_arrow_column(pa, values, arrow_type) for values, arrow_type in zip(column_values, types)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows_written += len(chunk)
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            column_values = [list(values) for values in zip(*chunk)]
+    finally:
+        if writer is not None:
+            writer.close()
+        conn.close()
+    return rows_written
+
+def export_results(sql: str, path, fmt: str = None) -> dict:
+    """
+    Export the full result of a query to a file.
+
+    Rows are written to `<path>.part`, which is renamed to `path` only once
+    the export completes and deleted if it fails, so `path` never holds a
+    truncated export.
+
+    Args:
+        sql: SELECT statement to export
+        path: Output file path
+        fmt: 'csv' or 'parquet'; inferred from the file extension when omitted
+
+    Returns:
+        dict with keys 'path', 'format', 'rows', 'bytes'
+    """
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".") or "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
+
+    part_path = path.with_name(path.name + ".part")
+    try:
+        rows = export_parquet(sql, part_path) if fmt == "parquet" else export_csv(sql, part_path)
+        os.replace(part_path, path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return {'path': str(path), 'format': fmt, 'rows': rows, 'bytes': path.stat().st_size}
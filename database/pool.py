@@ -0,0 +1,93 @@
+"""
+Read-only connection pool - Reuses SQLite connections for concurrent queries with time budgets
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from config import DB_POOL_SIZE
+from database.connection import get_readonly_connection
+from database.executor import execute_sql
+
+PROGRESS_STEPS = 1000  # SQLite VM instructions between deadline checks
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a query exceeds its time budget"""
+
+
+class ConnectionPool:
+    """Fixed-size pool of read-only connections, opened lazily"""
+
+    def __init__(self, size: int = DB_POOL_SIZE):
+        self.size = size
+        self._idle = queue.LifoQueue()  # Most recently used first, its pages are warmest
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, opening one if the pool is not yet full"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = get_readonly_connection()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def execute(self, sql: str, timeout: float) -> list:
+        """
+        Execute a read-only query on a pooled connection within `timeout` seconds.
+
+        Raises:
+            QueryTimeoutError: If the query is still running at the deadline
+            ValueError / Exception: As raised by execute_sql
+        """
+        deadline = time.monotonic() + timeout
+        with self.connection() as conn:
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_STEPS)
+            try:
+                return execute_sql(sql, conn=conn)
+            except Exception as e:
+                if time.monotonic() > deadline and "interrupted" in str(e):
+                    raise QueryTimeoutError(f"Query exceeded its {timeout:.1f}s time budget") from e
+                raise
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the process-wide read-only connection pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
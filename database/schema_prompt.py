@@ -1,13 +1,15 @@
 """
 Schema prompt template for LLM system prompts
 """
+from functools import lru_cache
 from pathlib import Path
 from database.schema_extractor import get_schema
 
 SCHEMA_FILE = Path(__file__).parent / "schema.txt"
 
+@lru_cache(maxsize=1)
 def get_schema_prompt():
-    """Get formatted schema for use in LLM system prompts"""
+    """Get formatted schema for use in LLM system prompts (loaded once per process)"""
     if SCHEMA_FILE.exists():
         with open(SCHEMA_FILE, "r", encoding="utf-8") as f:
             schema = f.read()
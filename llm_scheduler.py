@@ -0,0 +1,256 @@
+"""
+LLM request scheduler - Shares the Groq rate limit between concurrent tool calls
+A token bucket fed by the rate-limit response headers admits requests, 429s are
+retried with jittered backoff, interactive traffic goes ahead of batch traffic,
+and identical in-flight prompts are coalesced into a single network call.
+"""
+import contextvars
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from config import (
+    LLM_BACKOFF_BASE_S, LLM_BACKOFF_MAX_S, LLM_EXPECTED_OUTPUT_TOKENS,
+    LLM_MAX_RETRIES, LLM_TOKENS_PER_MINUTE
+)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+RETRYABLE_ERRORS = ("RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError")
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the LLM is still rate limited after every retry"""
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Run LLM calls made inside the block at the given priority (INTERACTIVE or BATCH)"""
+    if priority not in (INTERACTIVE, BATCH):
+        raise ValueError(f"Unknown priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough local token count (about 4 characters per token for English and SQL)"""
+    return max(1, (len(text) + 3) // 4)
+
+
+def parse_duration(value: str) -> float:
+    """Parse Groq reset durations like '7.66s', '2m59.56s', '120ms' or '3' into seconds"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    seconds = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        seconds += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return seconds
+
+
+class TokenBucket:
+    """
+    Tokens-per-minute limiter shared by every LLM call in the process.
+
+    Tokens refill continuously at capacity/60 per second. Response headers
+    correct the local estimate, and a 429 pauses all callers until the server's
+    retry-after has passed. While an interactive caller is waiting, batch
+    callers are not admitted.
+    """
+
+    def __init__(self, tokens_per_minute: int = LLM_TOKENS_PER_MINUTE):
+        self.capacity = float(tokens_per_minute)
+        self.tokens = float(tokens_per_minute)
+        self.refill_rate = self.capacity / 60
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiting = {INTERACTIVE: 0, BATCH: 0}
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def acquire(self, cost: int, priority: str = INTERACTIVE):
+        """Block until `cost` tokens are available for a caller of this priority"""
+        with self._cond:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    # Capacity can shrink while waiting (rate-limit headers); never wait for more
+                    needed = min(cost, self.capacity)
+                    now = time.monotonic()
+                    yielding = priority == BATCH and self.waiting[INTERACTIVE] > 0
+                    if now >= self.paused_until and not yielding and self.tokens >= needed:
+                        self.tokens -= needed
+                        return
+                    wait = max(self.paused_until - now, (needed - self.tokens) / self.refill_rate, 0.01)
+                    self._cond.wait(timeout=min(wait, 1.0))
+            finally:
+                self.waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Stop admitting requests for `seconds` (used after a 429)"""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers):
+        """Sync capacity and remaining tokens with Groq's x-ratelimit-* headers"""
+        limit = headers.get("x-ratelimit-limit-tokens")
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+        with self._cond:
+            if limit:
+                self.capacity = float(limit)
+                self.refill_rate = self.capacity / 60
+            if remaining is not None:
+                self._refill()
+                self.tokens = min(self.tokens, float(remaining))
+            self._cond.notify_all()
+
+
+def _status_code(error: Exception):
+    return getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = _status_code(error)
+    return type(error).__name__ in RETRYABLE_ERRORS or status == 429 or (status is not None and status >= 500)
+
+
+def _retry_after(error: Exception):
+    """Seconds the server asked us to wait, if the error carries response headers"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    return parse_duration(value) if value else None
+
+
+class LLMScheduler:
+    """Admits, retries and coalesces LLM calls through a shared TokenBucket"""
+
+    def __init__(self, bucket: TokenBucket = None, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE_S, backoff_max: float = LLM_BACKOFF_MAX_S):
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'coalesced': 0, 'retries': 0, 'rate_limited': 0}
+
+    def invoke(self, llm, prompt: str, coalesce: bool = True):
+        """
+        Call llm.invoke(prompt) under the rate limiter.
+
+        With `coalesce`, a caller whose prompt is already in flight on the same
+        model settings waits for that call's response instead of sending its own.
+        """
+        if not coalesce:
+            return self._invoke_with_retry(llm, prompt)
+
+        key = (getattr(llm, "model_name", None), getattr(llm, "temperature", None), prompt)
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._invoke_with_retry(llm, prompt)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _invoke_with_retry(self, llm, prompt: str):
+        cost = estimate_tokens(prompt) + LLM_EXPECTED_OUTPUT_TOKENS
+        priority = _priority.get()
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire(cost, priority)
+            with self._lock:
+                self._stats['calls'] += 1
+            try:
+                return llm.invoke(prompt)
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                rate_limited = _status_code(e) == 429 or type(e).__name__ == "RateLimitError"
+                if rate_limited:
+                    with self._lock:
+                        self._stats['rate_limited'] += 1
+                if attempt == self.max_retries:
+                    if rate_limited:
+                        raise RateLimitExceeded(
+                            f"LLM rate limit still exceeded after {self.max_retries} retries, please try again shortly"
+                        ) from e
+                    raise
+
+                # Full jitter, but never retry sooner than the server asked
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                retry_after = _retry_after(e)
+                if retry_after:
+                    delay = max(delay, retry_after)
+                    self.bucket.pause(retry_after)
+                with self._lock:
+                    self._stats['retries'] += 1
+                time.sleep(delay)
+
+    def stats(self) -> dict:
+        """Return call, retry, rate-limit and coalescing counters plus bucket state"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['tokens_available'] = round(self.bucket.tokens)
+        stats['tokens_per_minute'] = round(self.bucket.capacity)
+        return stats
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, creating it on first use"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
+
+def observe_rate_limit_headers(response):
+    """httpx response hook feeding every Groq response's headers into the bucket"""
+    get_scheduler().bucket.update_from_headers(response.headers)
+
+
+def invoke_llm(prompt: str, llm=None, coalesce: bool = True):
+    """Invoke the shared LLM (or `llm`) through the process-wide scheduler"""
+    if llm is None:
+        from llm_setup import get_llm
+        llm = get_llm()
+    return get_scheduler().invoke(llm, prompt, coalesce=coalesce)
@@ -1,19 +1,38 @@
 """
 LLM setup and initialization for GROQ
+langchain_groq is imported on first use so SQL-only code paths never load it.
 """
-from langchain_groq import ChatGroq
-from config import GROQ_API_KEY, LLM_MODEL, LLM_TEMPERATURE, validate_config
+from functools import lru_cache
+from config import LLM_MODEL, LLM_TEMPERATURE, get_groq_api_key, validate_config
 
-def get_llm():
-    """Initialize and return GROQ LLM instance"""
+@lru_cache(maxsize=1)
+def get_http_client():
+    """Return the HTTP client (and connection pool) shared by every LLM instance"""
+    import httpx
+    from llm_scheduler import observe_rate_limit_headers
+
+    return httpx.Client(event_hooks={"response": [observe_rate_limit_headers]})
+
+@lru_cache(maxsize=8)
+def get_llm(temperature: float = LLM_TEMPERATURE):
+    """Initialize and return the shared GROQ LLM instance for a temperature (built once per process)"""
     validate_config()  # Ensure API key is set
-    
+    from langchain_groq import ChatGroq
+
     llm = ChatGroq(
-        groq_api_key=GROQ_API_KEY,
+        groq_api_key=get_groq_api_key(),
         model_name=LLM_MODEL,
-        temperature=LLM_TEMPERATURE
+        temperature=temperature,
+        max_retries=0,  # Retries and backoff are handled by llm_scheduler
+        http_client=get_http_client()
     )
-    
+
     return llm
 
+def open_llm_connection():
+    """Open the pooled TCP/TLS connection to GROQ with a token-free request (listing models)"""
+    validate_config()
+    from groq import Groq
+
+    Groq(api_key=get_groq_api_key(), http_client=get_http_client(), max_retries=0).models.list()
 
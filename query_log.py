@@ -0,0 +1,147 @@
+"""
+Query log - Append-only JSONL record of every processed question
+Entries are queued by the request path and written in batches by a background
+thread, so logging never waits on disk I/O. Process pool workers write each
+entry synchronously instead (see use_synchronous_log).
+"""
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import QUERY_LOG_BATCH_SIZE, QUERY_LOG_FLUSH_INTERVAL_S, QUERY_LOG_PATH
+
+QUEUE_LIMIT = 10000  # Entries buffered before new ones are dropped
+
+
+def result_fingerprint(results: list) -> str:
+    """Order-insensitive hash of a result, stable across processes"""
+    from tools.sql_voter import result_signature
+
+    return hashlib.sha1(repr(result_signature(results)).encode("utf-8")).hexdigest()
+
+
+class QueryLog:
+    """Batched, append-only JSONL writer running on a daemon thread (or inline when synchronous)"""
+
+    def __init__(self, path: str = QUERY_LOG_PATH, batch_size: int = QUERY_LOG_BATCH_SIZE,
+                 flush_interval: float = QUERY_LOG_FLUSH_INTERVAL_S, synchronous: bool = False):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=QUEUE_LIMIT)
+        self._write_lock = threading.Lock()
+        self._thread = None
+        if not synchronous:
+            self._thread = threading.Thread(target=self._run, name="query-log", daemon=True)
+            self._thread.start()
+
+    def record(self, entry: dict):
+        """
+        Queue an entry without blocking; a timestamp and build id are added if missing.
+
+        A 'results' list is replaced by 'row_count' and 'result_hash' on the
+        writer thread, so hashing large results stays off the request path.
+        """
+        entry.setdefault('ts', datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+        entry.setdefault('build', os.getenv("BUILD_ID", "dev"))
+        if self._thread is None:
+            with self._write_lock:
+                try:
+                    self._write([entry])
+                except Exception:
+                    self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every queued entry has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+            try:
+                self._write(batch)
+            except Exception:
+                self.dropped += len(batch)  # The log must never take the writer thread down
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: list):
+        for entry in batch:
+            if 'results' in entry:
+                results = entry.pop('results')
+                entry['row_count'] = len(results) if results is not None else None
+                entry['result_hash'] = result_fingerprint(results) if results is not None else None
+        lines = "".join(json.dumps(entry, default=str) + "\n" for entry in batch)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def read_log(path: str = QUERY_LOG_PATH, since: str = None, until: str = None):
+    """
+    Yield logged entries whose timestamp falls in [since, until).
+
+    Args:
+        path: JSONL log file
+        since: Optional ISO timestamp (inclusive); naive times are taken as UTC
+        until: Optional ISO timestamp (exclusive)
+    """
+    def parse(ts):
+        parsed = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    since_ts = parse(since) if since else None
+    until_ts = parse(until) if until else None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            ts = parse(entry['ts'])
+            if (since_ts is None or ts >= since_ts) and (until_ts is None or ts < until_ts):
+                yield entry
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_query_log() -> QueryLog:
+    """Return the process-wide query log, starting its writer on first use"""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = QueryLog()
+            atexit.register(_log.flush)
+        return _log
+
+
+def use_synchronous_log(path: str = QUERY_LOG_PATH):
+    """
+    Make this process write each entry as it is recorded.
+
+    Used as the ProcessPoolExecutor initializer: pool workers exit via
+    os._exit, which skips atexit and kills the daemon writer thread, so a
+    batched log would lose each worker's last entries.
+    """
+    global _log
+    with _log_lock:
+        _log = QueryLog(path, synchronous=True)
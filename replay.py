@@ -0,0 +1,166 @@
+"""
+Replay - Re-runs a time window of logged questions against the current build
+Compares the SQL, results and per-stage latencies with the logged baseline and
+reports latency percentiles, so regressions are caught before deploying.
+
+Follow-up questions are skipped: they depend on the conversation they were asked in.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_scheduler import BATCH, llm_priority
+from query_log import read_log, result_fingerprint
+from service import percentile
+
+STAGES = ("rewrite", "enhance", "generate", "vote", "execute", "summarize", "total")
+PERCENTILES = (50, 90, 99)
+
+
+def load_baseline(path: str, since: str = None, until: str = None, limit: int = None) -> tuple:
+    """
+    Read the logged questions to replay.
+
+    Returns:
+        (entries, skipped) where skipped counts follow-up questions left out
+    """
+    entries = []
+    skipped = 0
+    for entry in read_log(path, since, until):
+        if entry.get('followup'):
+            skipped += 1
+            continue
+        entries.append(entry)
+        if limit is not None and len(entries) >= limit:
+            break
+    return entries, skipped
+
+
+def replay_entry(entry: dict) -> dict:
+    """Answer one logged question again, without writing it to the query log"""
+    from agents.react_agent import process_query
+
+    with llm_priority(BATCH):
+        result = process_query(entry['question'], candidates=entry.get('candidates') or 1, log=False)
+    results = result.get('results')
+    return {
+        'sql': result.get('sql'),
+        'row_count': len(results) if results is not None else None,
+        'result_hash': result_fingerprint(results) if results is not None else None,
+        'timings': result.get('timings', {}),
+        'error': result.get('error'),
+    }
+
+
+def _stage_percentiles(runs: list, stage: str) -> dict:
+    values = sorted(run['timings'][f"{stage}_ms"] for run in runs if f"{stage}_ms" in run.get('timings', {}))
+    return {f"p{pct}": percentile(values, pct) for pct in PERCENTILES} if values else None
+
+
+def compare(baseline: list, replayed: list, max_mismatches: int = 10) -> dict:
+    """
+    Compare replayed answers with their logged baseline.
+
+    Args:
+        baseline: Logged entries, in replay order
+        replayed: replay_entry() results, one per baseline entry
+        max_mismatches: Changed answers listed in full in the report
+
+    Returns:
+        dict with counts of changed SQL and results, errors on each side,
+        per-stage latency percentiles (ms) with their change in percent,
+        and the first changed answers
+    """
+    from tools.sql_voter import normalize_sql
+
+    report = {
+        'queries': len(baseline),
+        'sql_changed': 0,
+        'results_changed': 0,
+        'baseline_errors': 0,
+        'replay_errors': 0,
+        'new_errors': 0,
+        'stages': {},
+        'mismatches': [],
+    }
+
+    for logged, replay in zip(baseline, replayed):
+        report['baseline_errors'] += logged.get('error') is not None
+        report['replay_errors'] += replay['error'] is not None
+        if replay['error'] is not None and logged.get('error') is None:
+            report['new_errors'] += 1
+
+        both_answered = logged.get('sql') and replay['sql'] and logged.get('error') is None and replay['error'] is None
+        if not both_answered:
+            continue
+        sql_changed = normalize_sql(logged['sql']) != normalize_sql(replay['sql'])
+        results_changed = logged.get('result_hash') != replay['result_hash']
+        report['sql_changed'] += sql_changed
+        report['results_changed'] += results_changed
+        if results_changed and len(report['mismatches']) < max_mismatches:
+            report['mismatches'].append({
+                'question': logged['question'],
+                'baseline_sql': logged['sql'],
+                'replay_sql': replay['sql'],
+                'baseline_rows': logged.get('row_count'),
+                'replay_rows': replay['row_count'],
+            })
+
+    for stage in STAGES:
+        before = _stage_percentiles(baseline, stage)
+        after = _stage_percentiles(replayed, stage)
+        if before is None and after is None:
+            continue
+        change = None
+        if before and after:
+            change = {key: round((after[key] - before[key]) / before[key] * 100, 1) if before[key] else None
+                      for key in before}
+        report['stages'][stage] = {'baseline': before, 'replay': after, 'change_pct': change}
+
+    return report
+
+
+def run_replay(path: str, since: str = None, until: str = None, workers: int = 1,
+               limit: int = None, max_mismatches: int = 10) -> dict:
+    """
+    Replay a window of the query log and compare it with the logged answers.
+
+    A single worker reproduces the logged latencies most faithfully; more
+    workers replay faster and approximate concurrent production load.
+    """
+    baseline, skipped = load_baseline(path, since, until, limit)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        replayed = list(executor.map(replay_entry, baseline))
+
+    report = compare(baseline, replayed, max_mismatches)
+    report['skipped_followups'] = skipped
+    report['window'] = {'since': since, 'until': until}
+    return report
+
+
+def format_report(report: dict) -> str:
+    """Render a replay report as a plain text table"""
+    def cell(value):
+        return "-" if value is None else f"{value:g}"
+
+    lines = [
+        f"Replayed {report['queries']} queries ({report.get('skipped_followups', 0)} follow-ups skipped)",
+        f"SQL changed: {report['sql_changed']}, results changed: {report['results_changed']}, "
+        f"errors: {report['baseline_errors']} -> {report['replay_errors']} ({report['new_errors']} new)",
+        "",
+        f"{'stage':<10} {'pct':<4} {'baseline ms':>12} {'replay ms':>12} {'change %':>9}",
+    ]
+    for stage, stats in report['stages'].items():
+        for pct in PERCENTILES:
+            key = f"p{pct}"
+            before = stats['baseline'][key] if stats['baseline'] else None
+            after = stats['replay'][key] if stats['replay'] else None
+            change = stats['change_pct'][key] if stats['change_pct'] else None
+            lines.append(f"{stage:<10} {key:<4} {cell(before):>12} {cell(after):>12} {cell(change):>9}")
+
+    for mismatch in report['mismatches']:
+        lines += [
+            "",
+            f"Changed: {mismatch['question']}",
+            f"  baseline ({mismatch['baseline_rows']} rows): {mismatch['baseline_sql']}",
+            f"  replay   ({mismatch['replay_rows']} rows): {mismatch['replay_sql']}",
+        ]
+    return "\n".join(lines)
@@ -0,0 +1,215 @@
+"""
+Headless service - Runs process_query on a worker pool for programmatic clients
+Provides the pool used by `cli.py batch` and a dependency-free ASGI app.
+
+Run with:
+    uvicorn service:app --port 8000
+
+Endpoints:
+    POST /query    {"question": "...", "priority": "interactive" | "batch"} -> result as JSON
+    GET  /metrics  pool counters and latency percentiles
+    GET  /health   liveness check
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import SERVICE_MAX_PENDING, SERVICE_POOL, SERVICE_WORKERS
+from llm_scheduler import BATCH, INTERACTIVE, get_scheduler, llm_priority
+from query_log import use_synchronous_log
+
+
+class PoolFullError(Exception):
+    """Raised when admission control rejects a query because the queue is full"""
+
+
+def to_jsonable(result: dict) -> dict:
+    """Convert a process_query result into plain JSON-serializable values"""
+    jsonable = dict(result)
+    if 'results' in jsonable:
+        jsonable['results'] = [dict(row) for row in jsonable['results']]
+    return jsonable
+
+
+def run_query(question: str, priority: str = INTERACTIVE) -> dict:
+    """Worker entry point: answer one question and return a JSON-ready result"""
+    from agents.react_agent import process_query
+
+    start = time.perf_counter()
+    with llm_priority(priority):
+        result = to_jsonable(process_query(question))
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def percentile(sorted_values: list, pct: float):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class QueryPool:
+    """
+    Thread or process pool with bounded admission and latency metrics.
+
+    At most `max_pending` queries may be queued or running at once; beyond
+    that, submit() either blocks (batch callers) or raises PoolFullError
+    (HTTP callers, which answer 503 so clients can back off).
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, kind: str = SERVICE_POOL,
+                 max_pending: int = SERVICE_MAX_PENDING, priority: str = INTERACTIVE):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind} (expected 'thread' or 'process')")
+        if kind == "process":
+            # Workers skip atexit on shutdown, so they log synchronously
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=use_synchronous_log)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.priority = priority
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)  # Most recent per-query latencies (ms)
+        self._counters = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0, 'pending': 0}
+
+    def submit(self, question: str, block: bool = False, priority: str = None):
+        """Queue a question and return a concurrent.futures.Future of its result"""
+        priority = priority or self.priority
+        if priority not in (INTERACTIVE, BATCH):
+            raise ValueError(f"Unknown priority: {priority}")
+
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self._counters['rejected'] += 1
+            raise PoolFullError(f"Query queue is full ({self.max_pending} pending)")
+
+        with self._lock:
+            self._counters['submitted'] += 1
+            self._counters['pending'] += 1
+
+        start = time.perf_counter()
+        future = self.executor.submit(run_query, question, priority)
+        future.add_done_callback(lambda f: self._on_done(f, start))
+        return future
+
+    def _on_done(self, future, start: float):
+        """Release the admission slot and record the outcome"""
+        self._slots.release()
+        failed = future.exception() is not None or 'error' in future.result()
+        with self._lock:
+            self._counters['pending'] -= 1
+            self._counters['failed' if failed else 'completed'] += 1
+            self._latencies.append((time.perf_counter() - start) * 1000)
+
+    def metrics(self) -> dict:
+        """Return pool configuration, counters and latency percentiles (ms)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics = {'pool': self.kind, 'workers': self.workers, 'max_pending': self.max_pending}
+            metrics.update(self._counters)
+
+        for pct in (50, 95, 99):
+            value = percentile(latencies, pct)
+            metrics[f'latency_p{pct}_ms'] = round(value, 1) if value is not None else None
+        if self.kind == "thread":
+            # Process pools keep one scheduler per worker process, not visible here
+            metrics['llm'] = get_scheduler().stats()
+        return metrics
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> QueryPool:
+    """Return the process-wide pool used by the HTTP app, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = QueryPool()
+        return _pool
+
+
+async def _send_json(send, status: int, body: dict):
+    payload = json.dumps(body, default=str).encode("utf-8")
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def _read_body(receive) -> bytes:
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def _handle_query(receive, send):
+    try:
+        request = json.loads(await _read_body(receive) or b'{}')
+        question = request['question']
+        priority = request.get('priority', INTERACTIVE)
+        if not isinstance(question, str) or not question.strip():
+            raise ValueError("question must be a non-empty string")
+    except (ValueError, KeyError, TypeError, AttributeError):
+        await _send_json(send, 400, {'error': 'Expected a JSON body like {"question": "..."}'})
+        return
+
+    try:
+        future = get_pool().submit(question, priority=priority)
+    except ValueError as e:
+        await _send_json(send, 400, {'error': str(e)})
+        return
+    except PoolFullError as e:
+        await _send_json(send, 503, {'error': str(e)})
+        return
+
+    result = await asyncio.wrap_future(future)
+    await _send_json(send, 500 if 'error' in result else 200, result)
+
+
+async def _handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            get_pool()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _pool is not None:
+                _pool.shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application routing /query, /metrics and /health"""
+    if scope['type'] == 'lifespan':
+        await _handle_lifespan(receive, send)
+        return
+
+    route = (scope['method'], scope['path'])
+    if route == ('POST', '/query'):
+        await _handle_query(receive, send)
+    elif route == ('GET', '/metrics'):
+        await _send_json(send, 200, get_pool().metrics())
+    elif route == ('GET', '/health'):
+        await _send_json(send, 200, {'status': 'ok'})
+    else:
+        await _send_json(send, 404, {'error': f"No route for {scope['method']} {scope['path']}"})
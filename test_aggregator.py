@@ -0,0 +1,94 @@
+"""
+Tests for chart inference and SQL-side downsampling (uses a temporary SQLite database)
+"""
+from config import CHART_MAX_CATEGORIES, CHART_MAX_POINTS
+from database.aggregator import build_chart, infer_chart
+from database.executor import execute_sql
+from test_helpers import temporary_database
+
+def invoice_db():
+    """An Invoice table with one row per hour"""
+    return temporary_database(
+        "CREATE TABLE Invoice (InvoiceId INTEGER PRIMARY KEY, InvoiceDate DATETIME, "
+        "BillingCountry TEXT, Total NUMERIC)",
+        "INSERT INTO Invoice (InvoiceDate, BillingCountry, Total) "
+        "VALUES (datetime('2009-01-01', ? || ' hours'), ?, ?)",
+        [(i, f"Country {i % 30}", (i % 17) + 0.99) for i in range(5000)]
+    )
+
+def test_infer_chart():
+    """Chart type follows the result shape"""
+    assert infer_chart([{'n': 1}]) is None
+    assert infer_chart([{'d': '2009-01-01', 'Total': 1.0}, {'d': '2009-01-02', 'Total': 2.0}]) == ('line', 'd', ['Total'])
+    assert infer_chart([{'c': 'USA', 'Total': 1.0}, {'c': 'France', 'Total': 2.0}]) == ('bar', 'c', ['Total'])
+    assert infer_chart([{'Id': 1, 'Total': 1.0}, {'Id': 2, 'Total': 2.0}]) == ('histogram', 'Total', [])
+    assert infer_chart([{'Name': 'AC/DC'}, {'Name': 'Accept'}]) is None
+    assert infer_chart([{'Month': '2009-02', 'Revenue': 1.0}, {'Month': '2009-01', 'Revenue': 2.0}]) == ('line', 'Month', ['Revenue'])
+    assert infer_chart([{'Year': 2009, 'Revenue': 1.0}, {'Year': 2010, 'Revenue': 2.0}]) == ('line', 'Year', ['Revenue'])
+
+def test_large_time_series_is_bucketed():
+    """A large time series comes back as at most CHART_MAX_POINTS points"""
+    sql = "SELECT InvoiceDate, Total FROM Invoice"
+
+    with invoice_db():
+        chart = build_chart(sql, execute_sql(sql))
+
+    assert chart['chart'] == 'line' and chart['downsampled']
+    assert len(chart['data']['InvoiceDate']) <= CHART_MAX_POINTS
+    assert len(chart['data']['Total']) == len(chart['data']['InvoiceDate'])
+
+def test_monthly_series_keeps_time_order():
+    """strftime month buckets are charted as a line in time order, not as top-N bars"""
+    sql = ("SELECT strftime('%Y-%m', InvoiceDate) AS Month, SUM(Total) AS Revenue "
+           "FROM Invoice GROUP BY Month ORDER BY Revenue DESC")
+
+    with invoice_db():
+        chart = build_chart(sql, execute_sql(sql))
+
+    assert chart['chart'] == 'line' and not chart['downsampled']
+    assert chart['data']['Month'] == sorted(chart['data']['Month'])
+
+def test_large_monthly_series_is_bucketed():
+    """Partial dates are bucketed in time order too"""
+    sql = "SELECT strftime('%Y-%m', InvoiceDate) AS Month, Total FROM Invoice"
+
+    with invoice_db():
+        chart = build_chart(sql, execute_sql(sql))
+
+    assert chart['chart'] == 'line' and chart['downsampled']
+    assert chart['data']['Month'] == sorted(set(chart['data']['Month']))
+
+def test_large_categories_keep_top_n():
+    """Bar charts keep only the largest categories"""
+    sql = "SELECT BillingCountry, Total FROM Invoice;"
+
+    with invoice_db():
+        chart = build_chart(sql, execute_sql(sql))
+
+    assert chart['chart'] == 'bar'
+    assert len(chart['data']['BillingCountry']) == CHART_MAX_CATEGORIES
+    assert chart['data']['Total'] == sorted(chart['data']['Total'], reverse=True)
+
+def test_small_result_is_not_aggregated():
+    """Small results are charted as they are"""
+    sql = "SELECT BillingCountry, SUM(Total) AS Revenue FROM Invoice GROUP BY BillingCountry LIMIT 5"
+
+    with invoice_db():
+        chart = build_chart(sql, execute_sql(sql))
+
+    assert not chart['downsampled']
+    assert len(chart['data']['Revenue']) == 5
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Chart Aggregator Tests")
+    print("=" * 60)
+
+    test_infer_chart()
+    test_large_time_series_is_bucketed()
+    test_monthly_series_keeps_time_order()
+    test_large_monthly_series_is_bucketed()
+    test_large_categories_keep_top_n()
+    test_small_result_is_not_aggregated()
+
+    print("[OK] All aggregator tests passed")
@@ -0,0 +1,105 @@
+"""
+Tests for streaming CSV/Parquet export (uses a temporary SQLite database)
+"""
+import csv
+
+import database.exporter
+from database.exporter import export_parquet, export_results
+from test_helpers import temporary_database
+
+def invoice_line_db():
+    """An InvoiceLine table whose NUMERIC prices mix integer and real values"""
+    return temporary_database(
+        "CREATE TABLE InvoiceLine (InvoiceLineId INTEGER PRIMARY KEY, TrackName TEXT, UnitPrice NUMERIC)",
+        "INSERT INTO InvoiceLine (TrackName, UnitPrice) VALUES (?, ?)",
+        [(f"Track {i}", 1 if i < 100 else 0.99) for i in range(1000)]
+    )
+
+def test_csv_export():
+    """CSV export writes a header and every row"""
+    with invoice_line_db() as db_dir:
+        export = export_results("SELECT * FROM InvoiceLine", db_dir / "lines.csv")
+
+        with open(export['path'], newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+
+    assert export['format'] == "csv" and export['rows'] == 1000
+    assert rows[0] == ["InvoiceLineId", "TrackName", "UnitPrice"]
+    assert len(rows) == 1001
+
+def test_parquet_export_is_typed_across_chunks():
+    """Columns that turn real after the first chunk are still written as float64"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with invoice_line_db() as db_dir:
+        rows = export_parquet("SELECT * FROM InvoiceLine", db_dir / "lines.parquet", chunk_size=50)
+        table = pq.read_table(db_dir / "lines.parquet")
+        row_groups = pq.ParquetFile(db_dir / "lines.parquet").metadata.num_row_groups
+
+    assert rows == table.num_rows == 1000
+    assert table.schema.field("InvoiceLineId").type == pa.int64()
+    assert table.schema.field("TrackName").type == pa.string()
+    assert table.schema.field("UnitPrice").type == pa.float64()
+    assert row_groups == 20  # One row group per chunk
+
+def test_parquet_export_handles_late_text():
+    """Text appearing after the first chunk turns the column into strings instead of failing"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with temporary_database(
+        "CREATE TABLE Price (PriceId INTEGER PRIMARY KEY, Amount NUMERIC)",
+        "INSERT INTO Price (Amount) VALUES (?)",
+        [(i,) for i in range(200)] + [("n/a",)]
+    ) as db_dir:
+        rows = export_parquet("SELECT * FROM Price", db_dir / "prices.parquet", chunk_size=50)
+        table = pq.read_table(db_dir / "prices.parquet")
+
+    assert rows == 201
+    assert table.schema.field("Amount").type == pa.string()
+    assert table.column("Amount").to_pylist()[-2:] == ["199", "n/a"]
+
+def test_failed_export_leaves_no_file():
+    """A failure mid-export removes the partial file instead of leaving it at the output path"""
+    def failing_export(sql, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("InvoiceLineId\n1\n")
+        raise RuntimeError("disk full")
+
+    original_export = database.exporter.export_csv
+    with invoice_line_db() as db_dir:
+        database.exporter.export_csv = failing_export
+        try:
+            export_results("SELECT * FROM InvoiceLine", db_dir / "lines.csv")
+            assert False, "Expected RuntimeError"
+        except RuntimeError:
+            pass
+        finally:
+            database.exporter.export_csv = original_export
+
+        leftovers = list(db_dir.glob("lines.csv*"))
+
+    assert leftovers == []
+
+def test_export_rejects_writes():
+    """Exports go through the same read-only checks as queries"""
+    with invoice_line_db() as db_dir:
+        try:
+            export_results("DELETE FROM InvoiceLine", db_dir / "out.csv")
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Exporter Tests")
+    print("=" * 60)
+
+    test_csv_export()
+    test_parquet_export_is_typed_across_chunks()
+    test_parquet_export_handles_late_text()
+    test_failed_export_leaves_no_file()
+    test_export_rejects_writes()
+
+    print("[OK] All exporter tests passed")
@@ -0,0 +1,37 @@
+"""
+Shared helpers for tests that need a small SQLite database instead of Chinook
+"""
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import database.connection
+
+@contextmanager
+def temporary_database(schema: str, insert_sql: str, rows: list):
+    """
+    Create a database from `schema` and `rows` and point database.connection at it.
+
+    Args:
+        schema: CREATE statements, run as a script
+        insert_sql: Parameterized INSERT run once per row
+        rows: Parameter tuples for insert_sql
+
+    Yields:
+        The temporary directory holding the database (removed afterwards)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(schema)
+        conn.executemany(insert_sql, rows)
+        conn.commit()
+        conn.close()
+
+        original_path = database.connection.DATABASE_PATH
+        database.connection.DATABASE_PATH = str(db_path)
+        try:
+            yield Path(tmp)
+        finally:
+            database.connection.DATABASE_PATH = original_path
@@ -0,0 +1,61 @@
+"""
+Import-time budget tests
+Checks that light entry points do not pull in the LLM stack, using python -X importtime.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+HEAVY_MODULES = ("langchain_groq", "langchain_core", "groq", "streamlit")
+IMPORT_BUDGET_MS = 250  # Cumulative import time allowed for a light entry point
+
+def profile_import(module_name: str) -> dict:
+    """Import a module in a fresh interpreter and return {module: cumulative_ms}"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+def check_light_import(module_name: str):
+    """Assert a module loads no heavy dependency and stays within the time budget"""
+    timings = profile_import(module_name)
+
+    loaded_heavy = [name for name in timings if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded_heavy, f"{module_name} imported heavy modules: {loaded_heavy[:5]}"
+
+    elapsed = timings[module_name]
+    assert elapsed < IMPORT_BUDGET_MS, f"{module_name} took {elapsed:.1f} ms to import"
+    print(f"[OK] import {module_name}: {elapsed:.1f} ms")
+
+def test_cli_import_is_light():
+    """The CLI must start without loading the LLM stack"""
+    check_light_import("cli")
+
+def test_executor_import_is_light():
+    """SQL execution must not depend on the LLM stack"""
+    check_light_import("database.executor")
+
+def test_agent_import_is_light():
+    """The agent workflow loads langchain_groq on first LLM call, not on import"""
+    check_light_import("agents.react_agent")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Import-time Budget Tests")
+    print("=" * 60)
+
+    test_cli_import_is_light()
+    test_executor_import_is_light()
+    test_agent_import_is_light()
+
+    print("\n[OK] All import budget tests passed")
@@ -0,0 +1,154 @@
+"""
+Tests for the LLM request scheduler (no network or API key needed)
+"""
+import threading
+import time
+
+from llm_scheduler import (
+    BATCH, INTERACTIVE, LLMScheduler, RateLimitExceeded, TokenBucket, parse_duration
+)
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+class FakeRateLimitError(Exception):
+    """Mimics groq.RateLimitError: a 429 carrying response headers"""
+    status_code = 429
+
+    def __init__(self, retry_after="0"):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {'headers': {'retry-after': retry_after}})()
+
+class FakeLLM:
+    """Counts invocations; fails with a 429 for the first `failures` calls"""
+    model_name = "fake"
+    temperature = 0.1
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if calls <= self.failures:
+            raise FakeRateLimitError()
+        return FakeResponse(f"answer to {prompt}")
+
+def make_scheduler(**kwargs):
+    return LLMScheduler(TokenBucket(tokens_per_minute=1_000_000), backoff_base=0.001, backoff_max=0.01, **kwargs)
+
+def test_parse_duration():
+    """Groq reset headers come in several duration formats"""
+    assert parse_duration("2") == 2
+    assert parse_duration("7.66s") == 7.66
+    assert abs(parse_duration("2m59.56s") - 179.56) < 1e-9
+    assert parse_duration("120ms") == 0.12
+
+def test_retries_rate_limit_errors():
+    """429s are retried with backoff until a call succeeds"""
+    scheduler = make_scheduler()
+    llm = FakeLLM(failures=2)
+
+    response = scheduler.invoke(llm, "hello")
+
+    assert response.content == "answer to hello"
+    assert llm.calls == 3
+    assert scheduler.stats()['retries'] == 2
+
+def test_gives_up_with_clear_error():
+    """Persistent 429s surface as RateLimitExceeded rather than a generic error"""
+    scheduler = make_scheduler(max_retries=1)
+    llm = FakeLLM(failures=10)
+
+    try:
+        scheduler.invoke(llm, "hello")
+        assert False, "Expected RateLimitExceeded"
+    except RateLimitExceeded:
+        pass
+    assert llm.calls == 2
+
+def test_coalesces_identical_prompts():
+    """Concurrent identical prompts share one network call"""
+    scheduler = make_scheduler()
+    llm = FakeLLM(delay=0.2)
+    responses = []
+
+    threads = [
+        threading.Thread(target=lambda: responses.append(scheduler.invoke(llm, "same prompt")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert llm.calls == 1
+    assert len(responses) == 5
+    assert scheduler.stats()['coalesced'] == 4
+
+def test_interactive_goes_before_batch():
+    """When tokens run out, a waiting interactive caller is admitted before batch callers"""
+    bucket = TokenBucket(tokens_per_minute=600)  # Refills 10 tokens per second
+    bucket.tokens = 0
+    admitted = []
+
+    def take(priority, start_delay):
+        time.sleep(start_delay)
+        bucket.acquire(5, priority)
+        admitted.append(priority)
+
+    threads = [
+        threading.Thread(target=take, args=(BATCH, 0.0)),
+        threading.Thread(target=take, args=(INTERACTIVE, 0.05)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert admitted == [INTERACTIVE, BATCH]
+
+def test_headers_update_bucket():
+    """x-ratelimit-* headers correct the local token estimate"""
+    bucket = TokenBucket(tokens_per_minute=12000)
+    bucket.update_from_headers({'x-ratelimit-limit-tokens': '6000', 'x-ratelimit-remaining-tokens': '100'})
+
+    assert bucket.capacity == 6000
+    assert bucket.tokens < 200
+
+def test_waiter_survives_capacity_drop():
+    """A caller waiting for more tokens than a newly lowered capacity is still admitted"""
+    bucket = TokenBucket(tokens_per_minute=12000)
+    bucket.tokens = 0
+    waiter = threading.Thread(target=bucket.acquire, args=(8000,), daemon=True)
+    waiter.start()
+    time.sleep(0.05)
+
+    bucket.update_from_headers({'x-ratelimit-limit-tokens': '6000'})
+    with bucket._cond:
+        bucket.tokens = bucket.capacity  # As if the bucket had refilled completely
+        bucket._cond.notify_all()
+    waiter.join(timeout=2)
+
+    assert not waiter.is_alive()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("LLM Scheduler Tests")
+    print("=" * 60)
+
+    test_parse_duration()
+    test_retries_rate_limit_errors()
+    test_gives_up_with_clear_error()
+    test_coalesces_identical_prompts()
+    test_interactive_goes_before_batch()
+    test_headers_update_bucket()
+    test_waiter_survives_capacity_drop()
+
+    print("[OK] All scheduler tests passed")
@@ -0,0 +1,98 @@
+"""
+Tests for the query log and replay comparison (no database or LLM needed)
+"""
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from query_log import QueryLog, get_query_log, read_log, result_fingerprint, use_synchronous_log
+from replay import compare
+
+ROWS = [{'Name': 'AC/DC', 'Albums': 2}, {'Name': 'Accept', 'Albums': 2}]
+
+def test_entries_are_written_in_batches():
+    """Queued entries reach the file with their results replaced by a fingerprint"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "logs" / "query_log.jsonl"
+        log = QueryLog(path, batch_size=10, flush_interval=0.05)
+        for i in range(25):
+            log.record({'question': f"question {i}", 'sql': "SELECT 1", 'results': ROWS})
+        log.flush()
+
+        entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    assert [entry['question'] for entry in entries] == [f"question {i}" for i in range(25)]
+    assert 'results' not in entries[0]
+    assert entries[0]['row_count'] == 2
+    assert entries[0]['result_hash'] == result_fingerprint(list(reversed(ROWS)))
+    assert log.dropped == 0
+
+def record_question(i: int):
+    """Process pool task: log one question"""
+    get_query_log().record({'question': f"question {i}"})
+
+def test_process_workers_lose_no_entries():
+    """Process workers exit without atexit; their entries are written synchronously"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "query_log.jsonl"
+        with ProcessPoolExecutor(max_workers=2, initializer=use_synchronous_log, initargs=(str(path),)) as pool:
+            list(pool.map(record_question, range(10)))
+
+        questions = sorted(json.loads(line)['question'] for line in path.read_text(encoding="utf-8").splitlines())
+
+    assert questions == sorted(f"question {i}" for i in range(10))
+
+def test_read_log_window():
+    """since is inclusive, until is exclusive"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "query_log.jsonl"
+        timestamps = ["2026-10-01T09:00:00.000+00:00", "2026-10-02T09:00:00.000+00:00",
+                      "2026-10-03T09:00:00.000+00:00"]
+        path.write_text("".join(json.dumps({'ts': ts, 'question': ts}) + "\n" for ts in timestamps),
+                        encoding="utf-8")
+
+        window = [entry['ts'] for entry in read_log(path, since="2026-10-02T09:00:00", until="2026-10-03")]
+
+    assert window == [timestamps[1]]
+
+def test_replay_comparison():
+    """Changed results, new errors and latency changes are reported"""
+    fingerprint = result_fingerprint(ROWS)
+    baseline = [
+        {'question': "a", 'sql': "SELECT Name FROM Artist", 'result_hash': fingerprint, 'row_count': 2,
+         'timings': {'generate_ms': 100.0, 'total_ms': 200.0}, 'error': None},
+        {'question': "b", 'sql': "SELECT 1", 'result_hash': fingerprint, 'row_count': 2,
+         'timings': {'generate_ms': 100.0, 'total_ms': 200.0}, 'error': None},
+        {'question': "c", 'sql': "SELECT 2", 'result_hash': fingerprint, 'row_count': 2,
+         'timings': {'total_ms': 200.0}, 'error': None},
+    ]
+    replayed = [
+        {'sql': "select name from Artist;", 'result_hash': fingerprint, 'row_count': 2,
+         'timings': {'generate_ms': 150.0, 'total_ms': 300.0}, 'error': None},
+        {'sql': "SELECT 3", 'result_hash': "changed", 'row_count': 1,
+         'timings': {'generate_ms': 150.0, 'total_ms': 300.0}, 'error': None},
+        {'sql': None, 'result_hash': None, 'row_count': None,
+         'timings': {'total_ms': 300.0}, 'error': "rate limited"},
+    ]
+
+    report = compare(baseline, replayed)
+
+    assert report['sql_changed'] == 1
+    assert report['results_changed'] == 1
+    assert report['new_errors'] == 1
+    assert [mismatch['question'] for mismatch in report['mismatches']] == ["b"]
+    assert report['stages']['total']['change_pct']['p90'] == 50.0
+    assert 'summarize' not in report['stages']
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Query Log Tests")
+    print("=" * 60)
+
+    test_entries_are_written_in_batches()
+    test_process_workers_lose_no_entries()
+    test_read_log_window()
+    test_replay_comparison()
+
+    print("[OK] All query log tests passed")
@@ -0,0 +1,73 @@
+"""
+Tests for the compact result encoder used in summarizer prompts
+"""
+from config import SUMMARY_MAX_ROWS, SUMMARY_TOKEN_BUDGET
+from llm_scheduler import estimate_tokens
+from tools.result_encoder import encode_results, format_value
+
+def test_format_value():
+    """Numbers are formatted by type and long text is truncated"""
+    assert format_value(None) == ""
+    assert format_value(42) == "42"
+    assert format_value(3.0) == "3"
+    assert format_value(0.99) == "0.99"
+    assert format_value(10.001) == "10"
+    assert format_value(1234.5678) == "1234.57"
+    assert format_value(0.000123456) == "0.0001235"
+    assert format_value("a\tb\nc") == "a b c"
+    assert format_value("x" * 100, max_chars=10) == "x" * 9 + "…"
+
+def test_header_written_once():
+    """Column names appear once, rows are tab separated"""
+    rows = [{'Name': 'AC/DC', 'Albums': 2}, {'Name': 'Accept', 'Albums': 2}]
+
+    encoded = encode_results(rows)
+
+    assert encoded.splitlines() == ["Result (2 rows):", "Name\tAlbums", "AC/DC\t2", "Accept\t2"]
+
+def test_token_budget_enforced():
+    """Rows beyond the budget are replaced by a count of omitted rows"""
+    rows = [{'TrackId': i, 'Name': f"Track number {i}", 'UnitPrice': 0.99} for i in range(1000)]
+
+    encoded = encode_results(rows, token_budget=200, max_rows=1000)
+
+    assert estimate_tokens(encoded) <= 200
+    assert encoded.splitlines()[-1].endswith("more rows not shown")
+
+def test_wide_results_drop_columns():
+    """Wide results keep a bounded header and still fit the budget"""
+    rows = [{f"Column{c}": f"value {r}-{c}" for c in range(60)} for r in range(100)]
+
+    encoded = encode_results(rows)
+    lines = encoded.splitlines()
+
+    assert estimate_tokens(encoded) <= SUMMARY_TOKEN_BUDGET
+    assert "of 60 columns" in lines[0]
+    assert len(lines[1].split("\t")) <= 20
+    assert lines[-1].endswith("more rows not shown")
+
+def test_row_cap():
+    """Ordinary results send a small sample, not as many rows as the budget allows"""
+    rows = [{'Name': f"Artist {i}", 'Albums': i % 7, 'Revenue': i * 1.5} for i in range(100)]
+
+    lines = encode_results(rows).splitlines()
+
+    assert len(lines) == 2 + SUMMARY_MAX_ROWS + 1
+    assert lines[-1] == f"... {100 - SUMMARY_MAX_ROWS} more rows not shown"
+
+def test_empty_results():
+    assert encode_results([]) == "No results found."
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Result Encoder Tests")
+    print("=" * 60)
+
+    test_format_value()
+    test_header_written_once()
+    test_token_budget_enforced()
+    test_wide_results_drop_columns()
+    test_row_cap()
+    test_empty_results()
+
+    print("[OK] All result encoder tests passed")
@@ -0,0 +1,132 @@
+"""
+Tests for the worker pool, the ASGI service and batch input handling (process_query is stubbed, no LLM needed)
+"""
+import asyncio
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import agents.react_agent
+import cli
+import service
+from service import PoolFullError, QueryPool
+
+@contextmanager
+def stub_process_query(answer=None, gate: threading.Event = None):
+    """Replace process_query with a stub that optionally waits for `gate` before answering"""
+    def fake_process_query(question, *args, **kwargs):
+        if gate is not None:
+            gate.wait(timeout=5)
+        if question == "fail":
+            return {'error': "boom", 'summary': "I encountered an error: boom"}
+        return answer or {'sql': "SELECT 1", 'results': [], 'summary': f"Answer to {question}"}
+
+    original = agents.react_agent.process_query
+    agents.react_agent.process_query = fake_process_query
+    try:
+        yield
+    finally:
+        agents.react_agent.process_query = original
+
+def call_app(method: str, path: str, body: bytes = b'') -> tuple:
+    """Send one HTTP request through the ASGI app and return (status, JSON body)"""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(service.app({'type': 'http', 'method': method, 'path': path}, receive, send))
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+def test_admission_control():
+    """Beyond max_pending, submit() rejects unless the caller asks to block"""
+    gate = threading.Event()
+    with stub_process_query(gate=gate):
+        pool = QueryPool(workers=1, kind="thread", max_pending=2)
+        try:
+            futures = [pool.submit("q1"), pool.submit("q2")]
+            try:
+                pool.submit("q3")
+                assert False, "Expected PoolFullError"
+            except PoolFullError:
+                pass
+
+            blocked = []
+            waiter = threading.Thread(target=lambda: blocked.append(pool.submit("q4", block=True)))
+            waiter.start()
+            waiter.join(timeout=0.2)
+            assert waiter.is_alive()  # Waits for a free slot instead of failing
+
+            gate.set()
+            waiter.join(timeout=5)
+            results = [future.result(timeout=5) for future in futures + blocked]
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    assert [result['summary'] for result in results] == ["Answer to q1", "Answer to q2", "Answer to q4"]
+    assert pool.metrics()['rejected'] == 1
+
+def test_metrics_counters():
+    """Completed and failed queries are counted and latencies recorded"""
+    with stub_process_query():
+        pool = QueryPool(workers=2, kind="thread", max_pending=4)
+        try:
+            for question in ["a", "fail", "b"]:
+                pool.submit(question, block=True).result(timeout=5)
+        finally:
+            pool.shutdown()
+
+    metrics = pool.metrics()
+    assert (metrics['submitted'], metrics['completed'], metrics['failed'], metrics['pending']) == (3, 2, 1, 0)
+    assert metrics['latency_p50_ms'] is not None
+
+def test_query_endpoint_validates_question():
+    """Non-string or empty questions are rejected before reaching the pool"""
+    original_pool = service._pool
+    with stub_process_query():
+        service._pool = QueryPool(workers=1, kind="thread", max_pending=2)
+        try:
+            for body in [b'{"question": null}', b'{"question": 5}', b'{"question": "  "}', b'[1]', b'not json']:
+                status, response = call_app("POST", "/query", body)
+                assert status == 400, body
+            status, response = call_app("POST", "/query", b'{"question": "List artists"}')
+            metrics_status, metrics = call_app("GET", "/metrics")
+        finally:
+            service._pool.shutdown()
+            service._pool = original_pool
+
+    assert status == 200 and response['summary'] == "Answer to List artists"
+    assert metrics_status == 200 and metrics['submitted'] == 1
+
+def test_batch_reports_invalid_lines():
+    """Invalid input lines get an error line in input order and the batch continues"""
+    with tempfile.TemporaryDirectory() as tmp, stub_process_query():
+        input_path, output_path = Path(tmp) / "questions.jsonl", Path(tmp) / "results.jsonl"
+        input_path.write_text('{"id": 1, "question": "a"}\nnot json\n{"id": 3}\n{"id": 4, "question": "b"}\n',
+                              encoding="utf-8")
+
+        exit_code = cli.main(["batch", str(input_path), "-o", str(output_path), "--workers", "2"])
+        outputs = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+
+    assert exit_code == 1
+    assert [output.get('id', output.get('line')) for output in outputs] == [1, 2, 3, 4]
+    assert 'error' in outputs[1] and 'error' in outputs[2]
+    assert outputs[3]['summary'] == "Answer to b"
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Service Tests")
+    print("=" * 60)
+
+    test_admission_control()
+    test_metrics_counters()
+    test_query_endpoint_validates_question()
+    test_batch_reports_invalid_lines()
+
+    print("[OK] All service tests passed")
@@ -0,0 +1,84 @@
+"""
+Tests for conversation sessions and incremental follow-up execution (no database or LLM needed)
+"""
+from agents.session import ConversationSession
+
+PREVIOUS_SQL = "SELECT BillingCountry, Total, InvoiceDate FROM Invoice"
+PREVIOUS_ROWS = [
+    {'BillingCountry': 'USA', 'Total': 3.96, 'InvoiceDate': '2012-01-05 00:00:00'},
+    {'BillingCountry': 'France', 'Total': 5.94, 'InvoiceDate': '2012-03-11 00:00:00'},
+    {'BillingCountry': 'USA', 'Total': 1.98, 'InvoiceDate': '2013-02-01 00:00:00'},
+]
+
+def make_session() -> ConversationSession:
+    session = ConversationSession()
+    session.add_turn("invoices", "Show all invoices with country, total and date", PREVIOUS_SQL, PREVIOUS_ROWS)
+    return session
+
+def test_followup_detection():
+    """Only questions that build on a previous answer count as follow-ups"""
+    assert not ConversationSession().is_followup("now only for 2012")
+
+    session = make_session()
+    assert session.is_followup("now only for 2012")
+    assert session.is_followup("What about France?")
+    assert session.is_followup("sort those by total")
+    assert not session.is_followup("List all artists")
+    assert session.is_followup("only for 2012")
+    # Fresh questions that merely start with an imperative or mention "the same"
+    assert not session.is_followup("Sort all customers by country")
+    assert not session.is_followup("Order albums by title")
+    assert not session.is_followup("Filter tracks longer than 5 minutes")
+    assert not session.is_followup("Which artists have the same name as an album?")
+
+def test_rolling_context_is_bounded():
+    """The enhancer context keeps only the last few turns"""
+    session = make_session()
+    for i in range(10):
+        session.add_turn(f"question {i}", None, PREVIOUS_SQL, PREVIOUS_ROWS)
+
+    context = session.rolling_context()
+
+    assert "question 9" in context
+    assert "question 0" not in context
+    assert len(session.turns) <= session.max_turns
+
+def test_followup_runs_on_cached_result():
+    """A query over prev is answered from the cache and expanded for later reuse"""
+    session = make_session()
+
+    sql, results = session.execute_followup("SELECT * FROM prev WHERE InvoiceDate LIKE '2012%'")
+
+    assert [row['BillingCountry'] for row in results] == ['USA', 'France']
+    assert sql.startswith("SELECT * FROM (WITH prev AS (" + PREVIOUS_SQL)
+
+def test_edited_sql_is_not_expanded():
+    """A follow-up that edits the previous SQL directly is returned unchanged"""
+    session = make_session()
+    sql = PREVIOUS_SQL + " WHERE InvoiceDate LIKE '2012%'"
+
+    assert session.expand_sql(sql) == sql
+
+def test_semicolons_are_stripped_before_wrapping():
+    """LLM SQL usually ends with ';', which must not end up inside the subquery"""
+    session = ConversationSession()
+    session.add_turn("invoices", None, PREVIOUS_SQL + ";", PREVIOUS_ROWS)
+
+    sql, results = session.execute_followup("SELECT * FROM prev WHERE Total > 2;")
+
+    assert ";" not in sql
+    assert len(results) == 2
+    assert sql == f"SELECT * FROM (WITH prev AS ({PREVIOUS_SQL}) SELECT * FROM prev WHERE Total > 2)"
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Conversation Session Tests")
+    print("=" * 60)
+
+    test_followup_detection()
+    test_rolling_context_is_bounded()
+    test_followup_runs_on_cached_result()
+    test_edited_sql_is_not_expanded()
+    test_semicolons_are_stripped_before_wrapping()
+
+    print("[OK] All session tests passed")
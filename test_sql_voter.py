@@ -0,0 +1,131 @@
+"""
+Tests for multi-candidate SQL generation with execution-based voting (no LLM needed)
+"""
+from contextlib import contextmanager
+
+import llm_scheduler
+import tools.sql_voter
+from database.pool import ConnectionPool, QueryTimeoutError
+from test_helpers import temporary_database
+from tools.sql_voter import generate_sql_by_vote, normalize_sql
+
+class SerialExecutor:
+    """Stand-in for ThreadPoolExecutor so fake candidates come back in a fixed order"""
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, function, items):
+        return [function(item) for item in items]
+
+@contextmanager
+def artist_pool():
+    """Point connections at a temporary Artist table and yield a fresh pool for it"""
+    with temporary_database(
+        "CREATE TABLE Artist (ArtistId INTEGER PRIMARY KEY, Name TEXT)",
+        "INSERT INTO Artist (Name) VALUES (?)",
+        [(f"Artist {i}",) for i in range(100)]
+    ):
+        pool = ConnectionPool(size=2)
+        try:
+            yield pool
+        finally:
+            pool.close()
+
+def run_vote(candidate_sqls: list) -> dict:
+    """Vote over fixed candidates instead of LLM generations"""
+    replies = iter(candidate_sqls)
+    patches = {
+        'generate_sql': lambda query, temperature: next(replies),
+        'ThreadPoolExecutor': SerialExecutor,
+    }
+    originals = {name: getattr(tools.sql_voter, name) for name in [*patches, 'get_connection_pool']}
+    with artist_pool() as pool:
+        try:
+            for name, value in patches.items():
+                setattr(tools.sql_voter, name, value)
+            tools.sql_voter.get_connection_pool = lambda: pool
+            return generate_sql_by_vote("How many artists are there?", len(candidate_sqls))
+        finally:
+            for name, value in originals.items():
+                setattr(tools.sql_voter, name, value)
+
+def test_normalize_sql():
+    """Whitespace, case and trailing semicolons do not make candidates distinct"""
+    assert normalize_sql("SELECT  Name\nFROM Artist;") == normalize_sql("select name from artist")
+    assert normalize_sql("SELECT * FROM Artist WHERE Name = 'AC/DC'") != \
+        normalize_sql("SELECT * FROM Artist WHERE Name = 'ac/dc'")
+
+def test_majority_result_wins():
+    """Different SQL returning the same rows outvotes a lone disagreeing candidate"""
+    vote = run_vote([
+        "SELECT COUNT(*) FROM Artist WHERE ArtistId > 50",
+        "SELECT COUNT(*) FROM Artist",
+        "SELECT COUNT(ArtistId) FROM Artist",
+    ])
+
+    assert vote['sql'] == "SELECT COUNT(*) FROM Artist"
+    assert vote['results'][0][0] == 100
+    assert vote['agreement'] == round(2 / 3, 2)
+
+def test_duplicates_and_failures():
+    """Duplicates are executed once but still vote; failing candidates lower the agreement"""
+    vote = run_vote([
+        "SELECT COUNT(*) FROM Artist",
+        "select count(*) from artist;",
+        "SELECT COUNT(*) FROM NoSuchTable",
+    ])
+
+    candidates = vote['candidates']
+    assert candidates[1]['duplicate_of'] == 0
+    assert candidates[2]['error'] is not None
+    assert candidates[0]['votes'] == 2
+    assert vote['agreement'] == round(2 / 3, 2)
+
+def test_candidates_inherit_llm_priority():
+    """Worker threads generate candidates at the caller's LLM priority"""
+    priorities = []
+
+    def fake_generate_sql(query, temperature):
+        priorities.append(llm_scheduler._priority.get())
+        return "SELECT COUNT(*) FROM Artist"
+
+    original_generate, original_get_pool = tools.sql_voter.generate_sql, tools.sql_voter.get_connection_pool
+    with artist_pool() as pool:
+        try:
+            tools.sql_voter.generate_sql = fake_generate_sql
+            tools.sql_voter.get_connection_pool = lambda: pool
+            with llm_scheduler.llm_priority(llm_scheduler.BATCH):
+                generate_sql_by_vote("How many artists are there?", 3)
+        finally:
+            tools.sql_voter.generate_sql = original_generate
+            tools.sql_voter.get_connection_pool = original_get_pool
+
+    assert priorities == [llm_scheduler.BATCH] * 3
+
+def test_time_budget_enforced():
+    """A runaway candidate is interrupted at its time budget"""
+    with artist_pool() as pool:
+        try:
+            pool.execute("SELECT COUNT(*) FROM Artist a, Artist b, Artist c, Artist d", timeout=0.05)
+            assert False, "Expected QueryTimeoutError"
+        except QueryTimeoutError:
+            pass
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SQL Voter Tests")
+    print("=" * 60)
+
+    test_normalize_sql()
+    test_majority_result_wins()
+    test_duplicates_and_failures()
+    test_candidates_inherit_llm_priority()
+    test_time_budget_enforced()
+
+    print("[OK] All SQL voter tests passed")
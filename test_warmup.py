@@ -0,0 +1,83 @@
+"""
+Tests for the background startup warm-up (uses a temporary SQLite database, no API key needed)
+"""
+import sqlite3
+
+import warmup
+from database.schema_prompt import get_schema_prompt
+from test_helpers import temporary_database
+
+ARTIST_TABLE = (
+    "CREATE TABLE Artist (ArtistId INTEGER PRIMARY KEY, Name TEXT)",
+    "INSERT INTO Artist (Name) VALUES (?)",
+    [(f"Artist {i}",) for i in range(100)],
+)
+
+def reset_warmup():
+    """Return the module to its never-started state"""
+    warmup._thread = None
+    warmup._ready.clear()
+    warmup._status.update({'state': 'idle', 'stages': {}, 'errors': {}, 'total_ms': None})
+    get_schema_prompt.cache_clear()
+
+def run_warmup_without_llm() -> dict:
+    """Run the warm-up with no API key and return its final status"""
+    original_key = warmup.get_groq_api_key
+    warmup.get_groq_api_key = lambda: None
+    reset_warmup()
+    try:
+        warmup.start_warmup()
+        assert warmup.wait_for_warmup(timeout=30)
+        return warmup.get_warmup_status()
+    finally:
+        warmup.get_groq_api_key = original_key
+        reset_warmup()
+
+def test_warmup_reaches_ready():
+    """Every stage is timed; LLM stages fail without a key but do not stop the others"""
+    with temporary_database(*ARTIST_TABLE) as db_dir:
+        status = run_warmup_without_llm()
+        conn = sqlite3.connect(db_dir / "test.db")
+        has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+        conn.close()
+
+    assert status['state'] == 'ready'
+    assert list(status['stages']) == [name for name, _ in warmup.WARMUP_STAGES]
+    assert set(status['errors']) == {'llm_client', 'llm_connection'}
+    assert has_stats  # The analyze stage ran against the database
+
+def test_database_errors_are_recorded():
+    """A missing database is reported per stage instead of crashing the warm-up"""
+    with temporary_database(*ARTIST_TABLE) as db_dir:
+        (db_dir / "test.db").unlink()
+        status = run_warmup_without_llm()
+
+    assert status['state'] == 'ready'
+    assert {'analyze', 'pretouch'} <= set(status['errors'])
+
+def test_start_is_idempotent():
+    """Later calls reuse the running warm-up thread"""
+    original_stages = warmup.WARMUP_STAGES
+    warmup.WARMUP_STAGES = []
+    reset_warmup()
+    try:
+        warmup.start_warmup()
+        first_thread = warmup._thread
+        warmup.start_warmup()
+
+        assert warmup._thread is first_thread
+        assert warmup.wait_for_warmup(timeout=5)
+    finally:
+        warmup.WARMUP_STAGES = original_stages
+        reset_warmup()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Warm-up Tests")
+    print("=" * 60)
+
+    test_warmup_reaches_ready()
+    test_database_errors_are_recorded()
+    test_start_is_idempotent()
+
+    print("[OK] All warm-up tests passed")
@@ -1,19 +1,20 @@
 """
 Query Enhancer Tool - Rewrites/clarifies unclear queries using LLM
 """
-from llm_setup import get_llm
+from llm_scheduler import invoke_llm
 
-def enhance_query(user_query: str) -> str:
+def enhance_query(user_query: str, context: str = None) -> str:
     """
     Enhance/rewrite a user query to be clearer and more specific.
     
     Args:
         user_query: Original user query
+        context: Optional compact summary of earlier questions in the conversation
         
     Returns:
         Enhanced/clarified query
     """
-    llm = get_llm()
+    context_text = f"Earlier questions in this conversation:\n{context}\n\n" if context else ""
     
     prompt = f"""You are a query enhancement assistant. Your job is to rewrite user queries to be clearer and more specific for a SQL database.
 
@@ -24,11 +25,11 @@ Rules:
 - Preserve the user's intent completely
 - Keep the enhanced query concise - output ONLY the enhanced query, no explanations
 
-User Query: {user_query}
+{context_text}User Query: {user_query}
 
 Enhanced Query:"""
 
-    response = llm.invoke(prompt)
+    response = invoke_llm(prompt)
     enhanced = response.content.strip()
     
     # If LLM added explanation, extract just the query part
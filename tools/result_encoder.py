@@ -0,0 +1,96 @@
+"""
+Result Encoder - Compact, token-budgeted text encoding of SQL results for LLM prompts
+Column names are written once as a header, rows follow as tab-separated values.
+"""
+from config import SUMMARY_MAX_CELL_CHARS, SUMMARY_MAX_COLUMNS, SUMMARY_MAX_ROWS, SUMMARY_TOKEN_BUDGET
+from llm_scheduler import estimate_tokens
+
+def format_value(value, max_chars: int = SUMMARY_MAX_CELL_CHARS) -> str:
+    """
+    Format one cell for a prompt.
+
+    Whole floats drop their decimals, other floats keep at most 4 significant
+    digits below 1 and 2 decimals above, and long text is cut at max_chars.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return f"{value:.2f}".rstrip("0").rstrip(".") if abs(value) >= 1 else f"{value:.4g}"
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes>"
+
+    text = " ".join(str(value).split())  # Tabs and newlines would break the row layout
+    if len(text) > max_chars:
+        text = text[:max_chars - 1] + "…"
+    return text
+
+def _line_cost(line: str) -> int:
+    """Estimated tokens of a line including its newline, so line costs add up safely"""
+    return estimate_tokens(line + "\n")
+
+def encode_results(results: list, token_budget: int = SUMMARY_TOKEN_BUDGET,
+                   max_cell_chars: int = SUMMARY_MAX_CELL_CHARS,
+                   max_columns: int = SUMMARY_MAX_COLUMNS, max_rows: int = SUMMARY_MAX_ROWS) -> str:
+    """
+    Encode result rows as a row count, a header line and TSV-like rows.
+
+    Wide results keep their first max_columns columns, fewer if the header
+    and first row would take more than half the budget; the title says how
+    many were dropped. Rows are added while the whole block, including the header and
+    the note about omitted rows, stays within token_budget.
+
+    Args:
+        results: List of result rows (sqlite3.Row or dict)
+        token_budget: Maximum estimated tokens for the encoded block
+        max_cell_chars: Maximum characters kept per cell
+        max_columns: Maximum columns kept
+        max_rows: Maximum rows kept
+
+    Returns:
+        Encoded result text
+    """
+    if not results:
+        return "No results found."
+
+    total = len(results)
+    all_columns = list(results[0].keys())
+    columns = all_columns[:max(1, max_columns)]
+
+    def encode_row(row, columns):
+        return "\t".join(format_value(row[key], max_cell_chars) for key in columns)
+
+    def header(columns):
+        title = f"Result ({total} row{'s' if total != 1 else ''}"
+        if len(columns) < len(all_columns):
+            title += f", first {len(columns)} of {len(all_columns)} columns"
+        return [title + "):", "\t".join(columns)]
+
+    def width_cost(columns):
+        return sum(_line_cost(line) for line in header(columns)) + _line_cost(encode_row(results[0], columns))
+
+    while len(columns) > 1 and width_cost(columns) > token_budget // 2:
+        columns.pop()
+
+    lines = header(columns)
+    used = sum(_line_cost(line) for line in lines)
+    note_cost = _line_cost(f"... {total} more rows not shown")  # Reserved in case rows are cut
+
+    shown = 0
+    for row in results[:max_rows]:
+        line = encode_row(row, columns)
+        cost = _line_cost(line)
+        reserve = note_cost if shown + 1 < total else 0
+        if used + cost + reserve > token_budget:
+            break
+        lines.append(line)
+        used += cost
+        shown += 1
+
+    if shown < total:
+        lines.append(f"... {total - shown} more rows not shown")
+
+    return "\n".join(lines)
@@ -1,7 +1,8 @@
 """
 Result Summarizer Tool - Summarizes SQL results in natural language using LLM
 """
-from llm_setup import get_llm
+from llm_scheduler import invoke_llm
+from tools.result_encoder import encode_results
 
 def summarize_results(query: str, sql: str, results: list) -> str:
     """
@@ -9,33 +10,18 @@ def summarize_results(query: str, sql: str, results: list) -> str:
     
     Args:
         query: Original user query
-        sql: SQL query that was executed
+        sql: SQL query that was executed (not sent to the LLM; the result header names the columns)
         results: List of result rows (each row is a dict-like object)
         
     Returns:
         Natural language summary of results
     """
-    llm = get_llm()
-    
-    # Format results for prompt
-    if not results:
-        result_text = "No results found."
-    else:
-        # Convert results to readable format
-        if len(results) == 1:
-            result_text = "Result:\n" + str(dict(results[0]))
-        else:
-            result_text = f"Found {len(results)} results:\n"
-            # Show first few rows as examples
-            for i, row in enumerate(results[:5]):
-                result_text += f"\nRow {i+1}: {dict(row)}"
-            if len(results) > 5:
-                result_text += f"\n... and {len(results) - 5} more rows"
+    # Header once, then compact rows within the prompt token budget
+    result_text = encode_results(results)
     
     prompt = f"""You are a data analysis assistant. Summarize SQL query results in clear, natural language.
 
 Original Question: {query}
-SQL Query: {sql}
 
 {result_text}
 
@@ -47,7 +33,7 @@ Provide a clear, concise summary that answers the user's question.
 
 Summary:"""
 
-    response = llm.invoke(prompt)
+    response = invoke_llm(prompt)
     summary = response.content.strip()
     
     return summary
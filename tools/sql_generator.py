@@ -1,20 +1,22 @@
 """
 SQL Generator Tool - Generates SQL queries from natural language using LLM
 """
+from llm_scheduler import invoke_llm
 from llm_setup import get_llm
 from database.schema_prompt import get_schema_prompt
 
-def generate_sql(query: str) -> str:
+def generate_sql(query: str, temperature: float = None) -> str:
     """
     Generate SQL query from natural language query.
     
     Args:
         query: Natural language query (ideally enhanced)
+        temperature: Optional sampling temperature; when set, the call is never
+            coalesced with identical in-flight prompts (used for multiple candidates)
         
     Returns:
         SQL query string
     """
-    llm = get_llm()
     schema_prompt = get_schema_prompt()
     
     full_prompt = f"""{schema_prompt}
@@ -34,8 +36,20 @@ Important rules:
 
 SQL Query:"""
 
-    response = llm.invoke(full_prompt)
-    sql = response.content.strip()
+    if temperature is None:
+        response = invoke_llm(full_prompt)
+    else:
+        response = invoke_llm(full_prompt, llm=get_llm(temperature), coalesce=False)
+    return clean_sql(response.content)
+
+def clean_sql(text: str) -> str:
+    """
+    Strip markdown fences from an LLM reply and check it is a SELECT statement.
+    
+    Raises:
+        ValueError: If the cleaned query is not a SELECT statement
+    """
+    sql = text.strip()
     
     # Clean up SQL - remove markdown code blocks if present
     if sql.startswith("```sql"):
@@ -53,4 +67,40 @@ SQL Query:"""
     
     return sql
 
+def rewrite_sql(previous_sql: str, columns: list, follow_up: str):
+    """
+    Incrementally modify the previous query to answer a follow-up question.
+    
+    Only the previous SQL and its result columns are sent, not the schema,
+    so the prompt is a fraction of a full generation. The LLM may query the
+    previous result as the table `prev` instead of editing the SQL.
+    
+    Args:
+        previous_sql: SQL that answered the previous question
+        columns: Column names of the previous result
+        follow_up: Follow-up question from the user
+        
+    Returns:
+        SQL query string, or None if the follow-up needs a full generation
+    """
+    prompt = f"""You are a SQL expert editing a previous SQLite query to answer a follow-up question.
+
+Previous SQL:
+{previous_sql}
+
+Its result is available as the table prev({', '.join(columns)})
+
+Follow-up: {follow_up}
+
+Rules:
+- Make the smallest change: add or adjust a WHERE predicate, ORDER BY, LIMIT, or the selected columns
+- If the follow-up can be answered from the previous result alone, write a query over the table prev instead
+- If it needs tables or columns the previous SQL does not use, reply with exactly REGENERATE
+- Only SELECT statements, return ONLY the SQL query, no explanations or markdown formatting
+
+SQL Query:"""
 
+    response = invoke_llm(prompt)
+    if response.content.strip().upper().startswith("REGENERATE"):
+        return None
+    return clean_sql(response.content)
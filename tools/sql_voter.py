@@ -0,0 +1,121 @@
+"""
+SQL Voter Tool - Generates several candidate SQL queries and picks one by result agreement
+Candidates are generated concurrently, deduplicated after normalization, executed in
+parallel on pooled read-only connections and grouped by the rows they return.
+"""
+import contextvars
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import SQL_CANDIDATE_TEMPERATURE, SQL_CANDIDATE_TIMEOUT_S
+from database.pool import get_connection_pool
+from tools.sql_generator import generate_sql
+
+QUOTED_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+def normalize_sql(sql: str) -> str:
+    """Canonical form for deduplication: lowercase outside quotes, single spaces, no trailing ';'"""
+    parts = QUOTED_PATTERN.split(sql.strip().rstrip(";").strip())
+    for i in range(0, len(parts), 2):  # Even parts are outside quotes
+        parts[i] = " ".join(parts[i].lower().split())
+    return "".join(parts)
+
+def result_signature(results: list):
+    """Order-insensitive fingerprint of a result used to compare candidates"""
+    columns = list(results[0].keys()) if results else []
+    return len(columns), tuple(sorted(repr(tuple(row[c] for c in columns)) for row in results))
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    try:
+        return function(*args), None, (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return None, str(e), (time.perf_counter() - start) * 1000
+
+def _map_in_context(executor, function, items: list) -> list:
+    """executor.map, running each call in a copy of the caller's context (e.g. its llm_priority)"""
+    contexts = [contextvars.copy_context() for _ in items]
+    return list(executor.map(lambda pair: pair[0].run(function, pair[1]), zip(contexts, items)))
+
+def generate_sql_by_vote(query: str, n: int) -> dict:
+    """
+    Generate `n` candidate SQL queries and pick the answer most candidates agree on.
+
+    The first candidate uses the normal temperature, the rest use
+    SQL_CANDIDATE_TEMPERATURE for diversity. Ties go to the group containing the
+    earliest candidate.
+
+    Args:
+        query: Natural language query (ideally enhanced)
+        n: Number of candidates to request
+
+    Returns:
+        dict with keys 'sql', 'results', 'agreement' (winning votes / generated
+        candidates, so failed candidates count against it) and 'candidates' (per-candidate sql, timings, rows, votes, error)
+
+    Raises:
+        ValueError: If no candidate could be generated and executed
+    """
+    # None keeps the shared default client (and lets identical prompts coalesce)
+    temperatures = [None] + [SQL_CANDIDATE_TEMPERATURE] * (n - 1)
+
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        generated = _map_in_context(executor, lambda t: _timed(generate_sql, query, t), temperatures)
+
+    # Deduplicate, keeping the first occurrence of each normalized query
+    candidates = []
+    by_normalized = {}
+    for sql, error, generation_ms in generated:
+        candidate = {'sql': sql, 'generation_ms': round(generation_ms, 1), 'error': error, 'duplicate_of': None}
+        if sql is not None:
+            key = normalize_sql(sql)
+            if key in by_normalized:
+                candidate['duplicate_of'] = by_normalized[key]
+            else:
+                by_normalized[key] = len(candidates)
+        candidates.append(candidate)
+
+    unique = [i for i, c in enumerate(candidates) if c['sql'] is not None and c['duplicate_of'] is None]
+    if not unique:
+        raise ValueError(f"No valid SQL candidate was generated: {candidates[0]['error']}")
+
+    pool = get_connection_pool()
+    with ThreadPoolExecutor(max_workers=len(unique)) as executor:
+        executed = _map_in_context(
+            executor, lambda i: _timed(pool.execute, candidates[i]['sql'], SQL_CANDIDATE_TIMEOUT_S), unique
+        )
+
+    # Group executed candidates by the rows they return
+    results_by_index = {}
+    groups = {}
+    for i, (results, error, execution_ms) in zip(unique, executed):
+        candidates[i].update({'execution_ms': round(execution_ms, 1), 'error': error})
+        if results is not None:
+            candidates[i]['rows'] = len(results)
+            results_by_index[i] = results
+            groups.setdefault(result_signature(results), []).append(i)
+
+    if not groups:
+        raise ValueError(f"No SQL candidate executed successfully: {candidates[unique[0]]['error']}")
+
+    # A duplicate's vote counts for the candidate it duplicates
+    ballots = {}
+    for i, candidate in enumerate(candidates):
+        if candidate['sql'] is not None:
+            owner = candidate['duplicate_of'] if candidate['duplicate_of'] is not None else i
+            ballots[owner] = ballots.get(owner, 0) + 1
+
+    group_votes = {signature: sum(ballots[i] for i in group) for signature, group in groups.items()}
+    winning_signature = max(groups, key=lambda signature: (group_votes[signature], -groups[signature][0]))
+    for signature, group in groups.items():
+        for i in group:
+            candidates[i]['votes'] = group_votes[signature]
+
+    winner = groups[winning_signature][0]
+    return {
+        'sql': candidates[winner]['sql'],
+        'results': results_by_index[winner],
+        'agreement': round(group_votes[winning_signature] / len(candidates), 2),
+        'candidates': candidates,
+    }
@@ -0,0 +1,152 @@
+"""
+Startup warm-up - Pays cold-start costs in a background thread before the first query
+Pre-imports the LLM stack, loads the schema, refreshes SQLite statistics,
+pre-touches hot tables, builds the LLM client and opens its connection to GROQ.
+"""
+import importlib
+import threading
+import time
+
+from config import WARMUP_HOT_TABLES, get_groq_api_key
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_thread = None
+_status = {
+    'state': 'idle',  # idle -> running -> ready
+    'stages': {},     # stage name -> duration in ms
+    'errors': {},     # stage name -> error message
+    'total_ms': None,
+}
+
+
+def _import_heavy_modules():
+    """Import langchain_groq and the LLM tools so the first query skips the import tax"""
+    for module_name in (
+        "langchain_groq",
+        "tools.query_enhancer",
+        "tools.sql_generator",
+        "tools.result_summarizer",
+    ):
+        importlib.import_module(module_name)
+
+
+def _load_schema():
+    """Load the schema prompt into its process-wide cache"""
+    from database.schema_prompt import get_schema_prompt
+    get_schema_prompt()
+
+
+def _analyze_database():
+    """Collect planner statistics once; they persist in the database file"""
+    from database.connection import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            conn.execute("ANALYZE")
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def _pretouch_tables():
+    """Scan hot tables through the memory map so their pages are in the OS cache"""
+    from database.connection import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        existing = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        for table_name in WARMUP_HOT_TABLES:
+            if table_name in existing:
+                for _ in conn.execute(f'SELECT * FROM "{table_name}"'):
+                    pass
+    finally:
+        conn.close()
+
+
+def _build_llm_client():
+    """Build the shared LLM client (no request is sent, so no tokens are spent)"""
+    if not get_groq_api_key():
+        raise ValueError("GROQ_API_KEY not set, LLM client not built")
+    from llm_setup import get_llm
+    get_llm()
+
+
+def _open_llm_connection():
+    """Complete the TCP/TLS handshake now so the first question reuses the pooled connection"""
+    if not get_groq_api_key():
+        raise ValueError("GROQ_API_KEY not set, LLM connection not opened")
+    from llm_setup import open_llm_connection
+    open_llm_connection()
+
+
+WARMUP_STAGES = [
+    ('imports', _import_heavy_modules),
+    ('schema', _load_schema),
+    ('analyze', _analyze_database),
+    ('pretouch', _pretouch_tables),
+    ('llm_client', _build_llm_client),
+    ('llm_connection', _open_llm_connection),
+]
+
+
+def _run_warmup():
+    """Run every stage, recording timings; a failing stage does not stop the others"""
+    start = time.perf_counter()
+    for stage_name, stage in WARMUP_STAGES:
+        stage_start = time.perf_counter()
+        try:
+            stage()
+        except Exception as e:
+            with _lock:
+                _status['errors'][stage_name] = str(e)
+        with _lock:
+            _status['stages'][stage_name] = round((time.perf_counter() - stage_start) * 1000, 1)
+
+    with _lock:
+        _status['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        _status['state'] = 'ready'
+    _ready.set()
+
+
+def start_warmup():
+    """Start the warm-up thread once per process; later calls are no-ops"""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _status['state'] = 'running'
+        _thread = threading.Thread(target=_run_warmup, name="warmup", daemon=True)
+        _thread.start()
+
+
+def wait_for_warmup(timeout: float = None) -> bool:
+    """Block until warm-up finishes; returns False if the timeout expired first"""
+    return _ready.wait(timeout)
+
+
+def get_warmup_status() -> dict:
+    """Return a snapshot of warm-up state, per-stage timings (ms) and stage errors"""
+    with _lock:
+        return {
+            'state': _status['state'],
+            'stages': dict(_status['stages']),
+            'errors': dict(_status['errors']),
+            'total_ms': _status['total_ms'],
+        }
+
+
+if __name__ == "__main__":
+    start_warmup()
+    wait_for_warmup()
+    status = get_warmup_status()
+    for stage_name, duration in status['stages'].items():
+        error = status['errors'].get(stage_name)
+        print(f"{stage_name:<12} {duration:>8.1f} ms" + (f"  [ERROR] {error}" if error else ""))
+    print(f"[OK] Warm-up finished in {status['total_ms']} ms")